@@ -1,15 +1,31 @@
 import customtkinter as ctk
-import tkinter as tk
-from tkinter import ttk
-from PIL import Image, ImageTk
-import requests
-import json
-import sqlite3
-from datetime import datetime
-import re
-import io
-from typing import List, Dict
+from datetime import date, datetime
+import os
+from typing import Callable, List, Dict, Optional, Tuple
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tkinter import filedialog
+
+import data_transfer
+from image_loader import ImageLoader
+from ingredient_index import IngredientIndex
+from meal_calendar import MealCalendar, MealPlanRanges
+from nutrition_analytics import DASHBOARD_NUTRIENTS, NutritionStore
+from prefetch import DetailPrefetcher
+from recipe_cache import ResponseCache
+from recipe_details import RecipeContentCache, RecipeDetailsWindow
+from recipe_grid import RecipeCard, RecipeGrid
+from recipe_models import Recipe
+from request_scheduler import BATCH, INTERACTIVE, SPECULATIVE, RequestScheduler
+from revalidation import Revalidator, is_outage
+from single_flight import SingleFlight
+from shopping_aggregation import format_quantity
+from shopping_list import ShoppingList
+from spoonacular_client import SpoonacularClient, SpoonacularError
+from storage import Storage
+from thumbnail_cache import ThumbnailCache
+from tracing import tracer
+from ui_dispatcher import UIDispatcher
 
 # Set theme and color scheme
 ctk.set_appearance_mode("dark")
@@ -25,42 +41,119 @@ class ModernRecipeApp(ctk.CTk):
         
         # API Configuration
         self.API_KEY = ""
-        self.BASE_URL = "https://api.spoonacular.com/recipes"
+        # Point SPOONACULAR_BASE_URL at a local stub server to test offline behaviour
+        self.BASE_URL = os.environ.get('SPOONACULAR_BASE_URL', "https://api.spoonacular.com/recipes")
+        # Spoonacular's free plan; the real quota is picked up from response headers
+        self.DAILY_QUOTA_POINTS = 150
+        self.scheduler = RequestScheduler(daily_quota=self.DAILY_QUOTA_POINTS)
+        self.client = SpoonacularClient(self.API_KEY, self.BASE_URL, scheduler=self.scheduler)
+        self.BULK_CHUNK_SIZE = 100  # Max ids per informationBulk request
+        self.FETCH_WORKERS = 8
+        self.SEARCH_PAGE_SIZE = 12  # Four rows of three cards
+        self.MAX_SEARCH_RESULTS = 100  # findByIngredients upper limit for 'number'
+        self.FAVORITES_PAGE_SIZE = 30
+        self.SEARCH_DEBOUNCE_MS = 400  # Pause in typing before a live search starts
+        self.MIN_LIVE_SEARCH_LENGTH = 3
+        self.PREFETCH_CONCURRENCY = 2
+        self.PREFETCH_DAILY_BUDGET = 50  # Speculative requests allowed per day
         
-        # Initialize database
-        self.init_database()
+        self.view_generation = 0
+        self.startup_complete = False
         
-        # Create main layout
-        self.setup_main_layout()
+        # Worker threads hand UI updates to the Tk thread through the dispatcher
+        self.dispatcher = UIDispatcher(self)
         
         # Initialize variables
         self.current_recipe_id = None
         self.search_results = []
+        self.search_params = None
+        self.pending_search_params = None
+        self.search_generation = 0
+        self.search_future = None
+        self.search_after_id = None
+        
+        # One details window is reused for every recipe, with parsed tab text cached per recipe
+        self.details_window = None
+        self.details_content = RecipeContentCache()
+        self.meal_calendar = None
+        
+        # Create main layout (only what the default view needs)
+        self.setup_main_layout()
+        
+        # Everything else is built once the first frame is on screen
+        self.bind("<Map>", self.on_first_map, add="+")
+        
+    def on_first_map(self, event):
+        if event.widget is self and not self.startup_complete:
+            self.after_idle(self.finish_startup)
+        
+    def finish_startup(self):
+        """Create services and deferred widgets; safe to call more than once"""
+        if self.startup_complete:
+            return
+        self.startup_complete = True
+        
+        # Initialize database
+        self.init_database()
+        self.response_cache = ResponseCache(self.storage)
+        self.ingredient_index = IngredientIndex(self.storage)
+        self.nutrition_store = NutritionStore(self.storage)
+        self.shopping_list = ShoppingList(self.storage)
+        self.meal_plan_ranges = MealPlanRanges(self.storage, self.db_executor)
+        threading.Thread(target=self.backfill_ingredient_index, daemon=True).start()
+        
+        self.search_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='search')
+        self.detail_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='details')
+        self.detail_requests = SingleFlight()
+        
+        # Stale cached responses are shown at once and refreshed here, retried while offline
+        self.revalidator = Revalidator()
+        self.stale_recipes = set()
+        self.search_stale = False
+        self.search_source = None  # 'index' or 'api', shared by every page of the search
+        
+        # Low-priority background fetches of details for visible search results
+        # (nothing is worth prefetching while the API is unreachable)
+        self.prefetcher = DetailPrefetcher(
+            fetch=self.prefetch_recipe_information,
+            is_cached=lambda recipe_id: (self.revalidator.offline
+                                         or self.response_cache.contains('information', {'id': recipe_id})),
+            max_concurrency=self.PREFETCH_CONCURRENCY,
+            daily_budget=self.PREFETCH_DAILY_BUDGET
+        )
+        
+        # Background image downloads for recipe cards, backed by a disk cache
+        self.image_loader = ImageLoader(
+            self.client,
+            self.dispatcher,
+            thumbnail_cache=ThumbnailCache('thumbnails')
+        )
+        self.db_executor.submit(self.warm_thumbnail_cache)
+        
+        self.setup_filters()
         
     def init_database(self):
         """Initialize SQLite database"""
-        self.conn = sqlite3.connect('recipe_finder.db')
-        self.cursor = self.conn.cursor()
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS favorites (
-                recipe_id INTEGER PRIMARY KEY,
-                title TEXT,
-                image_url TEXT,
-                date_added TIMESTAMP
-            )
-        ''')
-        
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS meal_plans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                recipe_id INTEGER,
-                planned_date DATE,
-                meal_type TEXT
-            )
-        ''')
-        
-        self.conn.commit()
+        # Opens per-thread WAL connections and applies schema migrations
+        self.storage = Storage('recipe_finder.db')
+        self.db_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='db')
+
+    def warm_thumbnail_cache(self):
+        """Pre-fetch thumbnails for saved favorites so that view works offline"""
+        rows = self.storage.query("SELECT image_url FROM favorites WHERE image_url != ''")
+        self.image_loader.warm(row[0] for row in rows)
+
+    def backfill_ingredient_index(self):
+        """Index cached recipe details that predate the ingredient, nutrition and shopping list tables"""
+        for recipe in self.response_cache.values('information'):
+            if 'id' not in recipe:
+                continue
+            if not self.ingredient_index.is_indexed(recipe['id']):
+                self.ingredient_index.add_recipe_information(recipe)
+            if recipe.get('nutrition') and not self.nutrition_store.has_recipe(recipe['id']):
+                self.nutrition_store.add_recipe_information(recipe)
+            if not self.shopping_list.has_recipe(recipe['id']):
+                self.shopping_list.add_recipe_information(recipe)
 
     def setup_main_layout(self):
         """Create the main application layout"""
@@ -110,6 +203,28 @@ class ModernRecipeApp(ctk.CTk):
             btn.grid(row=idx+1, column=0, padx=20, pady=10)
             self.nav_buttons.append(btn)
             
+        # Settings and help
+        self.settings_btn = ctk.CTkButton(
+            self.sidebar,
+            text="⚙️ Settings",
+            font=ctk.CTkFont(size=14),
+            height=40,
+            corner_radius=8,
+            command=self.show_debug_panel
+        )
+        self.settings_btn.grid(row=98, column=0, padx=20, pady=10)
+        
+        self.help_btn = ctk.CTkButton(
+            self.sidebar,
+            text="❓ Help",
+            font=ctk.CTkFont(size=14),
+            height=40,
+            corner_radius=8
+        )
+        self.help_btn.grid(row=99, column=0, padx=20, pady=(10, 20))
+        
+    def setup_filters(self):
+        """Create the sidebar filter widgets"""
         # Filters section
         self.filters_frame = ctk.CTkFrame(self.sidebar)
         self.filters_frame.grid(row=5, column=0, padx=20, pady=10, sticky="ew")
@@ -139,25 +254,6 @@ class ModernRecipeApp(ctk.CTk):
         )
         self.time_slider.grid(row=3, column=0, padx=10, pady=5)
         
-        # Settings and help
-        self.settings_btn = ctk.CTkButton(
-            self.sidebar,
-            text="⚙️ Settings",
-            font=ctk.CTkFont(size=14),
-            height=40,
-            corner_radius=8
-        )
-        self.settings_btn.grid(row=98, column=0, padx=20, pady=10)
-        
-        self.help_btn = ctk.CTkButton(
-            self.sidebar,
-            text="❓ Help",
-            font=ctk.CTkFont(size=14),
-            height=40,
-            corner_radius=8
-        )
-        self.help_btn.grid(row=99, column=0, padx=20, pady=(10, 20))
-        
     def setup_main_content(self):
         """Create the main content area"""
         # Main content frame
@@ -186,6 +282,8 @@ class ModernRecipeApp(ctk.CTk):
             height=40
         )
         self.search_entry.pack(side="left", padx=(0, 10))
+        self.search_entry.bind("<KeyRelease>", self.schedule_live_search)
+        self.search_entry.bind("<Return>", lambda event: self.search_recipes())
         
         # Search button
         self.search_button = ctk.CTkButton(
@@ -208,232 +306,393 @@ class ModernRecipeApp(ctk.CTk):
         
         # Configure grid for cards
         self.recipe_scroll.grid_columnconfigure((0, 1, 2), weight=1)
+        self.recipe_grid = RecipeGrid(self.recipe_scroll, self.create_recipe_card, self.dispatcher, columns=3)
         
-    def create_recipe_card(self, recipe: Dict, row: int, col: int):
-        """Create a recipe card widget"""
-        card = ctk.CTkFrame(self.recipe_scroll)
-        card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+    def create_recipe_card(self) -> RecipeCard:
+        """Create a reusable recipe card widget for the grid"""
+        with tracer.span('ui.create_recipe_card', 'ui'):
+            return RecipeCard(
+                self.recipe_scroll,
+                self.image_loader,
+                on_view=self.show_recipe_details,
+                on_favorite=self.add_to_favorites
+            )
         
-        # Recipe image
-        if recipe.get('image'):
-            try:
-                response = requests.get(recipe['image'])
-                img = Image.open(io.BytesIO(response.content))
-                img = img.resize((200, 200), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                
-                img_label = ctk.CTkLabel(card, image=photo, text="")
-                img_label.image = photo  # Keep a reference
-                img_label.pack(padx=10, pady=10)
-            except:
-                # Fallback if image loading fails
-                img_label = ctk.CTkLabel(card, text="[No Image]", height=200)
-                img_label.pack(padx=10, pady=10)
-        
-        # Recipe title
-        title_label = ctk.CTkLabel(
-            card,
-            text=recipe['title'],
-            font=ctk.CTkFont(size=16, weight="bold"),
-            wraplength=180
-        )
-        title_label.pack(padx=10, pady=5)
+    def clear_recipe_view(self):
+        """Clear the main content, keeping pooled recipe cards for reuse"""
+        self.view_generation += 1
+        self.prefetcher.clear()
+        self.recipe_grid.clear()
+        self.recipe_scroll.configure(label_text="Recipe Results")
+        for widget in self.recipe_scroll.winfo_children():
+            if widget is self.meal_calendar:
+                widget.grid_remove()  # Kept with its cells for the next visit
+            elif not self.recipe_grid.owns(widget):
+                widget.destroy()
         
-        # Quick info
-        info_frame = ctk.CTkFrame(card)
-        info_frame.pack(fill="x", padx=10, pady=5)
+    def get_recipe_information(self, recipe_id: int) -> Dict:
+        """Fetch recipe information, using the response cache when possible
         
-        if recipe.get('readyInMinutes'):
-            time_label = ctk.CTkLabel(
-                info_frame,
-                text=f"⏱️ {recipe['readyInMinutes']} min"
-            )
-            time_label.pack(side="left", padx=5)
-            
-        if recipe.get('servings'):
-            servings_label = ctk.CTkLabel(
-                info_frame,
-                text=f"👥 Serves {recipe['servings']}"
-            )
-            servings_label.pack(side="left", padx=5)
-        
-        # Action buttons
-        btn_frame = ctk.CTkFrame(card)
-        btn_frame.pack(fill="x", padx=10, pady=10)
-        
-        view_btn = ctk.CTkButton(
-            btn_frame,
-            text="View Recipe",
-            width=90,
-            height=30,
-            command=lambda: self.show_recipe_details(recipe['id'])
-        )
-        view_btn.pack(side="left", padx=5)
-        
-        fav_btn = ctk.CTkButton(
-            btn_frame,
-            text="♥",
-            width=30,
-            height=30,
-            command=lambda: self.add_to_favorites(recipe)
-        )
-        fav_btn.pack(side="left", padx=5)
+        An expired cached copy is returned at once (and its id added to
+        stale_recipes) while a fresh copy is fetched in the background.
+        Concurrent calls for the same recipe and priority class share a
+        single request.
+        """
+        # Never join a less urgent caller's request: it would wait behind that
+        # class's queue and could be refused for lack of that class's quota
+        priority, _ = self.scheduler.current()
+        return self.detail_requests.do((recipe_id, priority), self._load_recipe_information, recipe_id)
         
-    def show_recipe_details(self, recipe_id: int):
-        """Show detailed recipe information in a new window"""
-        details_window = ctk.CTkToplevel(self)
-        details_window.title("Recipe Details")
-        details_window.geometry("800x900")
+    def _load_recipe_information(self, recipe_id: int) -> Dict:
+        entry = self.response_cache.lookup('information', {'id': recipe_id})
+        if entry is None:
+            return self._fetch_recipe_information(recipe_id)
+        recipe, fresh = entry
+        if not fresh:
+            self.revalidate_recipe(recipe_id)
+        return recipe
         
+    def _fetch_recipe_information(self, recipe_id: int) -> Dict:
+        """Request a recipe from the API and store it in the cache and indexes"""
         try:
-            # Fetch recipe details
-            params = {'apiKey': self.API_KEY}
-            response = requests.get(f"{self.BASE_URL}/{recipe_id}/information", params=params)
-            recipe = response.json()
-            
-            # Create tabview for organized information
-            tabview = ctk.CTkTabview(details_window)
-            tabview.pack(fill="both", expand=True, padx=20, pady=20)
-            
-            # Overview tab
-            overview_tab = tabview.add("Overview")
-            
-            # Title
-            ctk.CTkLabel(
-                overview_tab,
-                text=recipe['title'],
-                font=ctk.CTkFont(size=24, weight="bold")
-            ).pack(pady=10)
-            
-            # Quick info
-            info_frame = ctk.CTkFrame(overview_tab)
-            info_frame.pack(fill="x", pady=10)
-            
-            ctk.CTkLabel(
-                info_frame,
-                text=f"⏱️ {recipe.get('readyInMinutes', 'N/A')} minutes"
-            ).pack(side="left", padx=10)
-            
-            ctk.CTkLabel(
-                info_frame,
-                text=f"👥 Serves {recipe.get('servings', 'N/A')}"
-            ).pack(side="left", padx=10)
-            
-            # Ingredients tab
-            ingredients_tab = tabview.add("Ingredients")
-            ingredients_text = ctk.CTkTextbox(ingredients_tab)
-            ingredients_text.pack(fill="both", expand=True, padx=10, pady=10)
-            
-            for ingredient in recipe['extendedIngredients']:
-                ingredients_text.insert("end", f"• {ingredient['original']}\n")
-            
-            # Instructions tab
-            instructions_tab = tabview.add("Instructions")
-            instructions_text = ctk.CTkTextbox(instructions_tab)
-            instructions_text.pack(fill="both", expand=True, padx=10, pady=10)
-            
-            if recipe.get('instructions'):
-                clean_instructions = re.sub('<[^<]+?>', '', recipe['instructions'])
-                instructions_text.insert("end", clean_instructions)
-            else:
-                instructions_text.insert("end", "No instructions available.")
-            
-            # Nutrition tab
-            nutrition_tab = tabview.add("Nutrition")
-            nutrition_text = ctk.CTkTextbox(nutrition_tab)
-            nutrition_text.pack(fill="both", expand=True, padx=10, pady=10)
-            
-            if recipe.get('nutrition', {}).get('nutrients'):
-                for nutrient in recipe['nutrition']['nutrients']:
-                    nutrition_text.insert(
-                        "end",
-                        f"{nutrient['name']}: {nutrient['amount']}{nutrient['unit']}\n"
-                    )
-            
-            # Action buttons
-            action_frame = ctk.CTkFrame(details_window)
-            action_frame.pack(fill="x", padx=20, pady=10)
-            
-            ctk.CTkButton(
-                action_frame,
-                text="Add to Meal Plan",
-                command=lambda: self.add_to_meal_plan(recipe_id)
-            ).pack(side="left", padx=5)
-            
-            ctk.CTkButton(
-                action_frame,
-                text="Generate Shopping List",
-                command=lambda: self.generate_shopping_list(recipe_id)
-            ).pack(side="left", padx=5)
-            
+            recipe = self.client.information(recipe_id, include_nutrition=True)
         except Exception as e:
-            ctk.CTkLabel(
-                details_window,
-                text=f"Error loading recipe details: {str(e)}"
-            ).pack(pady=20)
-            
-    def search_recipes(self):
+            self.revalidator.report_failure(e)
+            raise
+        self.revalidator.report_success()
+        self.store_recipe_information(recipe)
+        self.stale_recipes.discard(recipe_id)
+        return recipe
+        
+    def store_recipe_information(self, recipe: Dict):
+        """Cache a fetched recipe and add it to the local indexes"""
+        self.response_cache.set('information', {'id': recipe['id']}, recipe)
+        self.ingredient_index.add_recipe_information(recipe)
+        self.nutrition_store.add_recipe_information(recipe)
+        self.shopping_list.add_recipe_information(recipe)
+        
+    def prefetch_recipe_information(self, recipe_id: int) -> Dict:
+        with self.scheduler.priority(SPECULATIVE, 'prefetch'):
+            return self.get_recipe_information(recipe_id)
+        
+    def revalidate_recipe(self, recipe_id: int):
+        """Refresh a stale cached recipe in the background"""
+        def refresh():
+            with self.scheduler.priority(SPECULATIVE, 'revalidate'):
+                return self._fetch_recipe_information(recipe_id)
+        
+        self.stale_recipes.add(recipe_id)
+        self.revalidator.submit(
+            ('information', recipe_id),
+            refresh,
+            lambda recipe: self.dispatcher.post(self.on_recipe_revalidated, Recipe.from_information(recipe))
+        )
+        
+    def on_recipe_revalidated(self, recipe: Recipe):
+        """Swap a refreshed recipe into the details window if it is showing it"""
+        self.details_content.discard(recipe.id)
+        window = self.details_window
+        if window is not None and window.winfo_exists() and window.recipe_id == recipe.id:
+            window.bind_recipe(recipe)
+            window.set_stale(False)
+        
+    def stored_recipe_information(self, recipe_id: int) -> Optional[Dict]:
+        """The cached /information payload of a recipe, even if expired"""
+        entry = self.response_cache.lookup('information', {'id': recipe_id})
+        return entry[0] if entry is not None else None
+        
+    def to_recipes(self, results: List[Dict]) -> List[Recipe]:
+        """Compact models for search results; details load from the cache when needed"""
+        return [Recipe.from_json(result, self.stored_recipe_information) for result in results]
+        
+    def request_recipe_information(self, recipe_id: int, on_success: Callable[[Recipe], None],
+                                   on_error: Callable[[Exception], None]):
+        """Fetch recipe information in the background; callbacks run on the Tk thread"""
+        def fetch():
+            try:
+                with self.scheduler.priority(INTERACTIVE, 'details'), self.prefetcher.foreground():
+                    recipe = Recipe.from_information(self.get_recipe_information(recipe_id))
+            except Exception as e:
+                self.dispatcher.post(on_error, e)
+            else:
+                self.dispatcher.post(on_success, recipe)
+        
+        self.detail_executor.submit(fetch)
+        
+    def fetch_recipes_information(self, recipe_ids: List[int], on_batch: Callable[[Dict[int, Dict]], None]):
+        """Fetch information for many recipes, reporting results in batches
+        
+        Recipe ids are deduplicated, cached recipes are reported first and the
+        rest are requested in chunks from the informationBulk endpoint, falling
+        back to concurrent single requests if the bulk call is rejected. Outages
+        and quota errors are raised instead.
+        """
+        unique_ids = list(dict.fromkeys(recipe_ids))
+        
+        cached = {}
+        missing = []
+        for recipe_id in unique_ids:
+            entry = self.response_cache.lookup('information', {'id': recipe_id})
+            if entry is None:
+                missing.append(recipe_id)
+                continue
+            cached[recipe_id], fresh = entry
+            if not fresh:
+                self.revalidate_recipe(recipe_id)
+        if cached:
+            on_batch(cached)
+        
+        for start in range(0, len(missing), self.BULK_CHUNK_SIZE):
+            chunk = missing[start:start + self.BULK_CHUNK_SIZE]
+            try:
+                batch = {recipe['id']: recipe
+                         for recipe in self.client.information_bulk(chunk, include_nutrition=True)}
+                for recipe in batch.values():
+                    self.store_recipe_information(recipe)
+            except Exception as e:
+                if isinstance(e, SpoonacularError) and e.status_code == 402:
+                    raise  # Out of points or refused by the scheduler; single requests would cost more
+                if is_outage(e) or self.revalidator.offline:
+                    raise  # Single requests would only fail the same way, each after its retries
+                batch = self._fetch_each_recipe_information(chunk)
+            on_batch(batch)
+        
+    def _fetch_each_recipe_information(self, recipe_ids: List[int]) -> Dict[int, Dict]:
+        """Fetch recipes with concurrent single requests, skipping any that fail
+        
+        Raises the last error only if none of them could be fetched.
+        """
+        batch = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            fetch = self.scheduler.bind(self.get_recipe_information)
+            futures = {executor.submit(fetch, recipe_id): recipe_id for recipe_id in recipe_ids}
+            for future in as_completed(futures):
+                try:
+                    batch[futures[future]] = future.result()
+                except Exception as e:
+                    error = e
+        if not batch and error is not None:
+            raise error
+        return batch
+        
+    def show_recipe_details(self, recipe_id: int):
+        """Show detailed recipe information in the shared details window"""
+        if self.details_window is None or not self.details_window.winfo_exists():
+            self.details_window = RecipeDetailsWindow(
+                self,
+                on_meal_plan=self.add_to_meal_plan,
+                on_shopping_list=self.generate_shopping_list,
+                content_cache=self.details_content
+            )
+        details_window = self.details_window
+        details_window.show_loading(recipe_id)
+        
+        def failed(e):
+            if details_window.winfo_exists():
+                details_window.show_error(recipe_id, f"Error loading recipe details: {str(e)}")
+        
+        def loaded(recipe):
+            if details_window.winfo_exists():
+                details_window.bind_recipe(recipe)
+                details_window.set_stale(recipe_id in self.stale_recipes)
+        
+        # Fetch recipe details off the UI thread
+        self.request_recipe_information(recipe_id, loaded, failed)
+        
+    def schedule_live_search(self, event=None):
+        """Debounce keystrokes in the search entry into a single search"""
+        self.finish_startup()
+        if self.search_after_id is not None:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(self.SEARCH_DEBOUNCE_MS, lambda: self.search_recipes(live=True))
+        
+    def search_recipes(self, live: bool = False):
         """Search for recipes based on current inputs"""
+        self.finish_startup()
+        self.search_after_id = None
         ingredients = self.search_entry.get().strip()
         if not ingredients:
-            self.show_error("Please enter ingredients to search for recipes.")
+            if not live:
+                self.show_error("Please enter ingredients to search for recipes.")
+            return
+        if live and len(ingredients) < self.MIN_LIVE_SEARCH_LENGTH:
             return
             
+        params = {
+            'ingredients': ingredients,
+            'number': self.SEARCH_PAGE_SIZE,
+            'ranking': 2,
+            'ignorePantry': True
+        }
+        
+        if self.diet_var.get() != 'None':
+            params['diet'] = self.diet_var.get().lower()
+        
+        max_time = int(self.time_slider.get())
+        if max_time > 0:
+            params['maxReadyTime'] = max_time
+        
+        # Coalesce identical queries: one already running, or already on screen
+        if params == self.pending_search_params:
+            return
+        if live and params == self.search_params:
+            return
+        
+        # Supersede the previous search; a queued one is cancelled outright,
+        # a running one has its results dropped by the generation check
+        self.search_generation += 1
+        generation = self.search_generation
+        if self.search_future is not None:
+            self.search_future.cancel()
+        self.pending_search_params = params
+        
         # Show loading indicator
         self.search_button.configure(state="disabled", text="Searching...")
         
         def search_thread():
             try:
-                params = {
-                    'apiKey': self.API_KEY,
-                    'ingredients': ingredients,
-                    'number': 9,  # Show 3x3 grid of results
-                    'ranking': 2,
-                    'ignorePantry': True
-                }
-                
-                if self.diet_var.get() != 'None':
-                    params['diet'] = self.diet_var.get().lower()
-                
-                max_time = int(self.time_slider.get())
-                if max_time > 0:
-                    params['maxReadyTime'] = max_time
-                
-                response = requests.get(f"{self.BASE_URL}/findByIngredients", params=params)
-                recipes = response.json()
-                
-                # Clear existing recipe cards
-                for widget in self.recipe_scroll.winfo_children():
-                    widget.destroy()
-                
-                # Create recipe cards in a grid
-                for i, recipe in enumerate(recipes):
-                    row = i // 3  # 3 cards per row
-                    col = i % 3
-                    self.create_recipe_card(recipe, row, col)
-                
-                self.search_results = recipes
-                
+                with self.scheduler.priority(INTERACTIVE, 'search'), self.prefetcher.foreground():
+                    recipes, stale, source = self.fetch_search_page(params, 0)
+                has_more = len(recipes) == self.SEARCH_PAGE_SIZE
+                self.dispatcher.post(finish_search, recipes, has_more, stale, source)
             except Exception as e:
-                self.show_error(f"Failed to search recipes: {str(e)}")
-            finally:
-                # Reset search button
-                self.search_button.configure(state="normal", text="Search Recipes")
+                self.dispatcher.post(finish_search, None, False, False, None, e)
         
-        # Run search in separate thread
-        threading.Thread(target=search_thread, daemon=True).start()
+        def finish_search(recipes, has_more, stale, source, error=None):
+            if generation != self.search_generation:
+                return  # A newer query has started since
+            self.pending_search_params = None
+            # Reset search button
+            self.search_button.configure(state="normal", text="Search Recipes")
+            if error is not None:
+                self.show_error(f"Failed to search recipes: {str(error)}")
+            else:
+                self.show_search_results(recipes, params, has_more, stale, source)
+        
+        # Run search on the search worker pool
+        self.search_future = self.search_executor.submit(search_thread)
     
-    def add_to_favorites(self, recipe: Dict):
-        """Add a recipe to favorites database"""
+    def fetch_search_page(self, params: Dict, offset: int,
+                          source: Optional[str] = None) -> Tuple[List[Recipe], bool, str]:
+        """Fetch one page of search results, from the local index when possible
+        
+        Returns (recipes, stale, source), where source is 'index' or 'api'.
+        The two rank results differently, so later pages must pass the
+        source of the first page to continue the same ranking. Expired
+        cached results, or local index results when the API is unreachable,
+        are returned with stale set while fresh results are fetched in the
+        background.
+        """
+        page_size = self.SEARCH_PAGE_SIZE
+        
+        # Answer from the local index when it has a full page of results
+        recipes = []
+        if source != 'api':
+            recipes = self.to_recipes(self.ingredient_index.search(
+                params['ingredients'],
+                number=page_size,
+                offset=offset,
+                diet=params.get('diet'),
+                max_ready_time=params.get('maxReadyTime')
+            ))
+            if len(recipes) == page_size or source == 'index':
+                return recipes, False, 'index'
+        
+        # findByIngredients has no offset, so ask for everything up to the end of this page
+        if offset >= self.MAX_SEARCH_RESULTS:
+            return recipes, False, 'index' if recipes else 'api'
+        cache_params = dict(params, number=min(offset + page_size, self.MAX_SEARCH_RESULTS))
+        entry = self.response_cache.lookup('findByIngredients', cache_params)
+        if entry is not None:
+            results, fresh = entry
+            if not fresh:
+                def refresh():
+                    with self.scheduler.priority(SPECULATIVE, 'revalidate'):
+                        return self._fetch_search_results(cache_params)
+                
+                self.revalidator.submit(('findByIngredients', tuple(sorted(cache_params.items()))), refresh)
+            return self.to_recipes(results[offset:]), not fresh, 'api'
+        
+        # Don't wait on a request that is bound to fail when the index has something to show
+        if self.revalidator.offline and recipes:
+            return recipes, True, 'index'
         try:
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO favorites (recipe_id, title, image_url, date_added) VALUES (?, ?, ?, ?)",
-                (recipe['id'], recipe['title'], recipe.get('image', ''), datetime.now())
+            results = self._fetch_search_results(cache_params)
+        except Exception:
+            if recipes:
+                return recipes, True, 'index'
+            raise
+        return self.to_recipes(results[offset:]), False, 'api'
+    
+    def _fetch_search_results(self, cache_params: Dict) -> List[Dict]:
+        """Run a findByIngredients search and store the results in the cache and index"""
+        try:
+            results = self.client.find_by_ingredients(
+                cache_params['ingredients'],
+                number=cache_params['number'],
+                ranking=cache_params['ranking'],
+                ignore_pantry=cache_params['ignorePantry'],
+                diet=cache_params.get('diet'),
+                max_ready_time=cache_params.get('maxReadyTime')
             )
-            self.conn.commit()
-            self.show_success(f"Added '{recipe['title']}' to favorites!")
         except Exception as e:
-            self.show_error(f"Failed to add to favorites: {str(e)}")
+            self.revalidator.report_failure(e)
+            raise
+        self.revalidator.report_success()
+        self.response_cache.set('findByIngredients', cache_params, results)
+        self.ingredient_index.add_search_results(results)
+        return results
+    
+    def show_search_results(self, recipes: List[Recipe], params: Dict = None, has_more: bool = False,
+                            stale: bool = False, source: Optional[str] = None):
+        """Show search results in the recipe grid, loading more pages on scroll
+        
+        source is where the first page came from; later pages come from the same place.
+        """
+        def load_more(offset, done):
+            def page_thread():
+                try:
+                    with self.scheduler.priority(INTERACTIVE, 'search'):
+                        page, _, _ = self.fetch_search_page(params, offset, source)
+                except Exception:
+                    page = []
+                done(page, len(page) == self.SEARCH_PAGE_SIZE)
+            
+            threading.Thread(target=page_thread, daemon=True).start()
+        
+        def prefetch_visible(visible):
+            self.prefetcher.enqueue(recipe.id for recipe in visible)
+        
+        self.clear_recipe_view()
+        self.recipe_grid.set_items(
+            recipes,
+            has_more=has_more,
+            load_more=load_more if params else None,
+            on_visible=prefetch_visible
+        )
+        self.search_results = self.recipe_grid.items
+        self.search_params = params
+        self.search_stale = stale
+        self.search_source = source
+        if stale:
+            self.recipe_scroll.configure(label_text="Recipe Results (offline: showing saved results)")
+    
+    def add_to_favorites(self, recipe: Recipe):
+        """Add a recipe to favorites database"""
+        def saved(error):
+            if error is None:
+                self.dispatcher.post(self.show_success, f"Added '{recipe.title}' to favorites!")
+            else:
+                self.dispatcher.post(self.show_error, f"Failed to add to favorites: {str(error)}")
+        
+        self.storage.submit_write(
+            "INSERT OR REPLACE INTO favorites (recipe_id, title, image_url, date_added) VALUES (?, ?, ?, ?)",
+            (recipe.id, recipe.title, recipe.image or '', datetime.now()),
+            callback=saved
+        )
+        if recipe.image:
+            self.image_loader.warm([recipe.image])
     
     def add_to_meal_plan(self, recipe_id: int):
         """Add a recipe to meal plan"""
@@ -467,19 +726,27 @@ class ModernRecipeApp(ctk.CTk):
         
         def save_to_meal_plan():
             try:
-                date = date_entry.get()
-                meal = meal_var.get()
-                
-                self.cursor.execute(
-                    "INSERT INTO meal_plans (recipe_id, planned_date, meal_type) VALUES (?, ?, ?)",
-                    (recipe_id, date, meal)
-                )
-                self.conn.commit()
-                
-                self.show_success("Added to meal plan!")
-                meal_plan_window.destroy()
-            except Exception as e:
-                self.show_error(f"Failed to add to meal plan: {str(e)}")
+                planned_date = date.fromisoformat(date_entry.get().strip()).isoformat()
+            except ValueError:
+                self.show_error("Please enter the date as YYYY-MM-DD")
+                return
+            meal = meal_var.get()
+            
+            def saved(error):
+                if error is None:
+                    self.meal_plan_ranges.invalidate()
+                    if self.meal_calendar is not None:
+                        self.dispatcher.post(self.meal_calendar.refresh)
+                    self.dispatcher.post(self.show_success, "Added to meal plan!")
+                    self.dispatcher.post(meal_plan_window.destroy)
+                else:
+                    self.dispatcher.post(self.show_error, f"Failed to add to meal plan: {str(error)}")
+            
+            self.storage.submit_write(
+                "INSERT INTO meal_plans (recipe_id, planned_date, meal_type) VALUES (?, ?, ?)",
+                (recipe_id, planned_date, meal),
+                callback=saved
+            )
         
         # Save button
         ctk.CTkButton(
@@ -490,11 +757,15 @@ class ModernRecipeApp(ctk.CTk):
     
     def generate_shopping_list(self, recipe_id: int):
         """Generate a shopping list for a recipe"""
+        self.request_recipe_information(
+            recipe_id,
+            self.show_recipe_shopping_list,
+            lambda e: self.show_error(f"Failed to generate shopping list: {str(e)}")
+        )
+    
+    def show_recipe_shopping_list(self, recipe: Recipe):
+        """Show the shopping list window for a fetched recipe"""
         try:
-            params = {'apiKey': self.API_KEY}
-            response = requests.get(f"{self.BASE_URL}/{recipe_id}/information", params=params)
-            recipe = response.json()
-            
             shopping_window = ctk.CTkToplevel(self)
             shopping_window.title("Shopping List")
             shopping_window.geometry("500x700")
@@ -502,7 +773,7 @@ class ModernRecipeApp(ctk.CTk):
             # Shopping list header
             ctk.CTkLabel(
                 shopping_window,
-                text=f"Shopping List for {recipe['title']}",
+                text=f"Shopping List for {recipe.title}",
                 font=ctk.CTkFont(size=20, weight="bold")
             ).pack(padx=20, pady=10)
             
@@ -511,16 +782,16 @@ class ModernRecipeApp(ctk.CTk):
             shopping_text.pack(fill="both", expand=True, padx=20, pady=10)
             
             # Add ingredients to list
-            for ingredient in recipe['extendedIngredients']:
-                shopping_text.insert("end", f"□ {ingredient['original']}\n")
+            for ingredient in recipe.ingredients:
+                shopping_text.insert("end", f"□ {ingredient.original}\n")
             
             # Export button
             def export_list():
                 file_path = "shopping_list.txt"
                 with open(file_path, "w") as f:
-                    f.write(f"Shopping List for {recipe['title']}\n\n")
-                    for ingredient in recipe['extendedIngredients']:
-                        f.write(f"□ {ingredient['original']}\n")
+                    f.write(f"Shopping List for {recipe.title}\n\n")
+                    for ingredient in recipe.ingredients:
+                        f.write(f"□ {ingredient.original}\n")
                 self.show_success(f"Shopping list exported to {file_path}")
             
             ctk.CTkButton(
@@ -534,88 +805,170 @@ class ModernRecipeApp(ctk.CTk):
     
     def show_favorites(self):
         """Display favorite recipes"""
-        # Clear existing recipe cards
-        for widget in self.recipe_scroll.winfo_children():
-            widget.destroy()
-        
-        try:
-            # Fetch favorites from database
-            self.cursor.execute("SELECT * FROM favorites ORDER BY date_added DESC")
-            favorites = self.cursor.fetchall()
+        def load_page(offset, done):
+            def query():
+                try:
+                    rows = self.storage.query(
+                        "SELECT recipe_id, title, image_url FROM favorites "
+                        "ORDER BY date_added DESC LIMIT ? OFFSET ?",
+                        (self.FAVORITES_PAGE_SIZE, offset)
+                    )
+                except Exception as e:
+                    self.dispatcher.post(self.show_error, f"Failed to load favorites: {str(e)}")
+                    done([], False)  # Otherwise the grid keeps waiting for this page
+                    return
+                recipes = [
+                    Recipe(recipe_id, title, image_url, loader=self.stored_recipe_information)
+                    for recipe_id, title, image_url in rows
+                ]
+                done(recipes, len(recipes) == self.FAVORITES_PAGE_SIZE)
             
-            if not favorites:
-                ctk.CTkLabel(
-                    self.recipe_scroll,
-                    text="No favorite recipes yet!",
-                    font=ctk.CTkFont(size=16)
-                ).pack(pady=20)
+            # Query off the UI thread
+            self.db_executor.submit(query)
+        
+        self.clear_recipe_view()
+        view = self.view_generation
+        
+        def show_first_page(recipes, has_more):
+            if view != self.view_generation:
+                return  # The user has moved to another view
+            if not recipes:
+                self.recipe_grid.show_message("No favorite recipes yet!")
                 return
-            
-            # Create cards for each favorite
-            for i, fav in enumerate(favorites):
-                recipe = {
-                    'id': fav[0],
-                    'title': fav[1],
-                    'image': fav[2]
-                }
-                row = i // 3
-                col = i % 3
-                self.create_recipe_card(recipe, row, col)
-                
-        except Exception as e:
-            self.show_error(f"Failed to load favorites: {str(e)}")
+            self.recipe_grid.set_items(recipes, has_more=has_more, load_more=load_page)
+        
+        # Fetch the first page of favorites; more are loaded while scrolling
+        load_page(0, lambda recipes, has_more: self.dispatcher.post(show_first_page, recipes, has_more))
     
     def show_meal_plan(self):
-        """Display meal plan calendar"""
-        # Clear main content
-        for widget in self.recipe_scroll.winfo_children():
-            widget.destroy()
+        """Display the meal plan calendar, reusing it between visits"""
+        self.clear_recipe_view()
         
-        # Create calendar view (simplified)
-        calendar_frame = ctk.CTkFrame(self.recipe_scroll)
-        calendar_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        if self.meal_calendar is None:
+            self.meal_calendar = MealCalendar(
+                self.recipe_scroll,
+                self.meal_plan_ranges,
+                self.dispatcher,
+                on_error=self.show_error
+            )
+            ctk.CTkButton(
+                self.meal_calendar.header,
+                text="📊 Nutrition Dashboard",
+                command=self.show_nutrition_dashboard
+            ).pack(side="right", padx=10)
+            self.meal_calendar.grid(row=0, column=0, columnspan=3, sticky="nsew", padx=20, pady=20)
+        else:
+            self.meal_calendar.grid()
+            self.meal_calendar.refresh()
+    
+    def load_planned_nutrition(self):
+        """Make sure every planned recipe has stored nutrients
         
-        # Fetch meal plans
-        try:
-            self.cursor.execute("""
-                SELECT mp.planned_date, mp.meal_type, f.title 
-                FROM meal_plans mp 
-                JOIN favorites f ON mp.recipe_id = f.recipe_id 
-                ORDER BY mp.planned_date, mp.meal_type
-            """)
-            meals = self.cursor.fetchall()
-            
-            if not meals:
-                ctk.CTkLabel(
-                    calendar_frame,
-                    text="No meals planned yet!",
-                    font=ctk.CTkFont(size=16)
-                ).pack(pady=20)
+        Cached details fetched with nutrition are used first; the rest are
+        fetched in bulk once, after which the dashboard needs no API calls.
+        """
+        missing = []
+        for recipe_id in self.nutrition_store.planned_without_nutrition():
+            recipe = self.response_cache.get('information', {'id': recipe_id})
+            if recipe is not None and recipe.get('nutrition'):
+                self.nutrition_store.add_recipe_information(recipe)
+            else:
+                missing.append(recipe_id)
+        
+        for start in range(0, len(missing), self.BULK_CHUNK_SIZE):
+            chunk = missing[start:start + self.BULK_CHUNK_SIZE]
+            for recipe in self.client.information_bulk(chunk, include_nutrition=True):
+                self.store_recipe_information(recipe)
+    
+    def show_nutrition_dashboard(self):
+        """Show weekly and monthly nutrient totals for the meal plan"""
+        dashboard_window = ctk.CTkToplevel(self)
+        dashboard_window.title("Nutrition Dashboard")
+        dashboard_window.geometry("900x600")
+        
+        period_var = ctk.StringVar(value="Weekly")
+        ctk.CTkSegmentedButton(
+            dashboard_window,
+            values=["Daily", "Weekly", "Monthly"],
+            variable=period_var,
+            command=lambda value: load()
+        ).pack(pady=(20, 10))
+        
+        summary_label = ctk.CTkLabel(dashboard_window, text="Loading nutrition data...")
+        summary_label.pack(pady=5)
+        
+        table = ctk.CTkTextbox(dashboard_window, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        table.pack(fill="both", expand=True, padx=20, pady=(5, 20))
+        
+        periods = {"Daily": "day", "Weekly": "week", "Monthly": "month"}
+        
+        def render(data, error=None):
+            if not dashboard_window.winfo_exists() or data is not None and data['period'] != periods[period_var.get()]:
+                return
+            if error is not None:
+                summary_label.configure(text=f"Failed to load nutrition data: {str(error)}")
                 return
             
-            # Create meal plan display
-            for date, meal_type, title in meals:
-                meal_frame = ctk.CTkFrame(calendar_frame)
-                meal_frame.pack(fill="x", padx=10, pady=5)
-                
-                ctk.CTkLabel(
-                    meal_frame,
-                    text=f"{date} - {meal_type}:",
-                    font=ctk.CTkFont(weight="bold")
-                ).pack(side="left", padx=10)
-                
-                ctk.CTkLabel(
-                    meal_frame,
-                    text=title
-                ).pack(side="left", padx=10)
-                
-        except Exception as e:
-            self.show_error(f"Failed to load meal plan: {str(e)}")
+            matrix = data['matrix']
+            columns = [(nutrient, matrix.column_of[nutrient], matrix.units[matrix.column_of[nutrient]])
+                       for nutrient in DASHBOARD_NUTRIENTS if nutrient in matrix.column_of]
+            # Meals without a usable date can't be placed in a period; count them as unknown
+            total_meals = int(data['meals'].sum()) + data['undated']
+            unknown = int(data['unknown'].sum()) + data['undated']
+            summary_label.configure(
+                text=f"{total_meals} planned meals, {len(matrix.recipe_ids)} recipes with nutrition data, "
+                     f"totals computed in {data['elapsed_ms']:.1f} ms"
+                     + (f" ({unknown} meals without data)" if unknown else "")
+            )
+            
+            lines = [f"{'Period':<20}{'Meals':>6}" + ''.join(f"{f'{name} ({unit})':>22}" for name, _, unit in columns)]
+            for start, meals, totals in zip(data['period_starts'], data['meals'], data['totals']):
+                day = start.item()
+                if data['period'] == 'month':
+                    label = day.strftime("%B %Y")
+                elif data['period'] == 'week':
+                    label = f"Week of {day.isoformat()}"
+                else:
+                    label = day.strftime("%a %Y-%m-%d")
+                lines.append(f"{label:<20}{meals:>6}" + ''.join(f"{totals[column]:>22,.1f}" for _, column, _ in columns))
+            if total_meals == 0:
+                lines.append("No meals planned yet!")
+            
+            table.delete("1.0", "end")
+            table.insert("end", "\n".join(lines) + "\n")
+        
+        def load():
+            period = periods[period_var.get()]
+            
+            def query():
+                try:
+                    data = self.nutrition_store.dashboard(period)
+                except Exception as e:
+                    self.dispatcher.post(render, None, e)
+                else:
+                    self.dispatcher.post(render, data)
+            
+            def fetch_missing():
+                # May wait on the API; keep it off db_executor, which only runs SQLite work
+                try:
+                    with self.scheduler.priority(BATCH, 'nutrition'), self.prefetcher.foreground():
+                        self.load_planned_nutrition()
+                except Exception as e:
+                    self.dispatcher.post(render, None, e)
+                else:
+                    self.db_executor.submit(query)
+            
+            self.detail_executor.submit(fetch_missing)
+        
+        load()
     
     def handle_navigation(self, section: str):
         """Handle navigation button clicks"""
+        self.finish_startup()
         if section == "Search":
-            self.setup_recipe_cards_view()
+            has_more = self.search_params is not None and len(self.search_results) % self.SEARCH_PAGE_SIZE == 0
+            self.show_search_results(self.search_results, self.search_params, has_more, self.search_stale,
+                                     self.search_source)
         elif section == "Favorites":
             self.show_favorites()
         elif section == "Meal Plan":
@@ -625,13 +978,18 @@ class ModernRecipeApp(ctk.CTk):
             self.show_combined_shopping_list()
     
     def show_combined_shopping_list(self):
-        """Show shopping list for all planned meals"""
+        """Show the shopping list for all planned meals
+        
+        Items come from the materialized shopping list in one read; recipes
+        planned before their ingredients were known are fetched afterwards.
+        Clicking an item checks it off.
+        """
         shopping_window = ctk.CTkToplevel(self)
         shopping_window.title("Combined Shopping List")
         shopping_window.geometry("600x800")
         
-        # Create tabview for organized lists
-        tabview = ctk.CTkTabview(shopping_window)
+        # The By Meal tab is only queried once it is opened
+        tabview = ctk.CTkTabview(shopping_window, command=lambda: load_meals())
         tabview.pack(fill="both", expand=True, padx=20, pady=20)
         
         # All items tab
@@ -644,45 +1002,241 @@ class ModernRecipeApp(ctk.CTk):
         meal_list = ctk.CTkTextbox(by_meal_tab)
         meal_list.pack(fill="both", expand=True, padx=10, pady=10)
         
-        try:
-            # Fetch all planned meals
-            self.cursor.execute("""
-                SELECT mp.planned_date, mp.meal_type, f.title, mp.recipe_id
-                FROM meal_plans mp 
-                JOIN favorites f ON mp.recipe_id = f.recipe_id 
-                ORDER BY mp.planned_date
-            """)
-            meals = self.cursor.fetchall()
-            
-            if not meals:
-                all_list.insert("end", "No meals planned!\n")
+        all_list.insert("end", "Loading ingredients...\n")
+        meal_list.insert("end", "Loading ingredients...\n")
+        
+        line_items = {}  # Text line number -> [item, checked]
+        
+        def render_items(rows, loading):
+            """Redraw the All Items tab, grouped by aisle"""
+            if not shopping_window.winfo_exists():
+                return
+            all_list.configure(state="normal")
+            all_list.delete("1.0", "end")
+            line_items.clear()
+            if not rows:
+                all_list.insert("end", "Loading ingredients...\n" if loading else "No meals planned!\n")
+            current_aisle = None
+            for item, name, aisle, unit, amount, lines, meals, checked in rows:
+                if aisle != current_aisle:
+                    current_aisle = aisle
+                    all_list.insert("end", f"\n{current_aisle}\n")
+                line_items[int(all_list.index("end-1c").split('.')[0])] = [item, checked]
+                all_list.insert("end", f"{'☑' if checked else '□'} {format_quantity(amount, unit)} {name}\n")
+            if loading and rows:
+                all_list.insert("end", "\nLoading more ingredients...\n")
+            all_list.configure(state="disabled")
+        
+        def toggle_item(event):
+            line = int(all_list.index(f"@{event.x},{event.y}").split('.')[0])
+            entry = line_items.get(line)
+            if entry is None:
+                return
+            entry[1] = not entry[1]
+            all_list.configure(state="normal")
+            all_list.delete(f"{line}.0", f"{line}.1")
+            all_list.insert(f"{line}.0", '☑' if entry[1] else '□')
+            all_list.configure(state="disabled")
+            self.shopping_list.set_checked(entry[0], entry[1])
+        
+        all_list.bind("<Button-1>", toggle_item)
+        
+        def render_meals(rows):
+            if not shopping_window.winfo_exists():
+                return
+            meal_list.delete("1.0", "end")
+            if not rows:
                 meal_list.insert("end", "No meals planned!\n")
+            current_meal = None
+            for meal_id, planned_date, meal_type, title, name, amount, unit in rows:
+                if meal_id != current_meal:
+                    current_meal = meal_id
+                    meal_list.insert("end", f"\n{planned_date} - {meal_type}: {title}\n")
+                meal_list.insert("end", f"□ {format_quantity(amount, unit)} {name}\n")
+        
+        def load_meals():
+            if tabview.get() != "By Meal":
                 return
             
-            # Fetch ingredients for each meal
-            all_ingredients = {}
-            for date, meal_type, title, recipe_id in meals:
-                params = {'apiKey': self.API_KEY}
-                response = requests.get(f"{self.BASE_URL}/{recipe_id}/information", params=params)
-                recipe = response.json()
+            def query():
+                try:
+                    self.dispatcher.post(render_meals, self.shopping_list.meals())
+                except Exception as e:
+                    self.dispatcher.post(self.show_error, f"Failed to load meals: {str(e)}")
+            
+            self.db_executor.submit(query)
+        
+        def load_thread():
+            try:
+                missing = self.shopping_list.planned_without_lines()
+                self.dispatcher.post(render_items, self.shopping_list.items(), bool(missing))
+                if not missing:
+                    return
+                
+                def add_batch(batch):
+                    for recipe in batch.values():
+                        self.shopping_list.add_recipe_information(recipe)
+                    self.dispatcher.post(render_items, self.shopping_list.items(), True)
                 
-                # Add to by-meal list
-                meal_list.insert("end", f"\n{date} - {meal_type}: {title}\n")
-                for ingredient in recipe['extendedIngredients']:
-                    meal_list.insert("end", f"□ {ingredient['original']}\n")
-                    
-                    # Add to combined list
-                    all_ingredients[ingredient['original']] = all_ingredients.get(ingredient['original'], 0) + 1
+                with self.scheduler.priority(BATCH, 'shopping_list'), self.prefetcher.foreground():
+                    self.fetch_recipes_information(missing, add_batch)
+                self.dispatcher.post(render_items, self.shopping_list.items(), False)
+                self.dispatcher.post(lambda: shopping_window.winfo_exists() and load_meals())
+            except Exception as e:
+                self.dispatcher.post(self.show_error, f"Failed to generate shopping list: {str(e)}")
+        
+        # Read off the UI thread; only missing recipes need the network
+        threading.Thread(target=load_thread, daemon=True).start()
+    
+    def export_data(self, directory: str, fmt: str):
+        """Export favorites, meal plans and cached recipes to a folder in the background"""
+        if not directory:
+            return
+        
+        def export():
+            try:
+                counts = data_transfer.export_all(self.storage, directory, fmt)
+            except Exception as e:
+                self.dispatcher.post(self.show_error, f"Export failed: {str(e)}")
+                return
+            summary = ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+            self.dispatcher.post(self.show_success, f"Exported {summary} to {directory}")
+        
+        self.db_executor.submit(export)
+    
+    def import_data(self, directory: str):
+        """Import every dataset file found in a folder in the background"""
+        if not directory:
+            return
+        
+        def imported():
+            try:
+                counts = data_transfer.import_all(self.storage, directory)
+            except Exception as e:
+                self.dispatcher.post(self.show_error, f"Import failed: {str(e)}")
+                return
+            if not counts:
+                self.dispatcher.post(self.show_error, f"No favorites, meal_plans or recipe_cache files found in {directory}")
+                return
             
-            # Add to all items list
-            for ingredient, count in all_ingredients.items():
-                if count > 1:
-                    all_list.insert("end", f"□ {ingredient} (x{count})\n")
-                else:
-                    all_list.insert("end", f"□ {ingredient}\n")
-                    
-        except Exception as e:
-            self.show_error(f"Failed to generate shopping list: {str(e)}")
+            # Rows were written behind the caches' backs
+            self.response_cache.recount()
+            self.meal_plan_ranges.invalidate()
+            if self.meal_calendar is not None:
+                self.dispatcher.post(self.meal_calendar.refresh)
+            threading.Thread(target=self.backfill_ingredient_index, daemon=True).start()
+            
+            summary = ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+            self.dispatcher.post(self.show_success, f"Imported {summary}")
+        
+        self.db_executor.submit(imported)
+    
+    def show_debug_panel(self):
+        """Show settings: bulk data transfer and tracing histograms for the hot paths"""
+        self.finish_startup()
+        panel = ctk.CTkToplevel(self)
+        panel.title("Settings")
+        panel.geometry("760x650")
+        
+        # Bulk transfer of favorites, meal plans and cached recipes
+        data_controls = ctk.CTkFrame(panel)
+        data_controls.pack(fill="x", padx=20, pady=(20, 0))
+        
+        ctk.CTkLabel(data_controls, text="Data").pack(side="left", padx=10, pady=10)
+        format_var = ctk.StringVar(value="jsonl")
+        ctk.CTkSegmentedButton(data_controls, values=list(data_transfer.FORMATS), variable=format_var).pack(
+            side="left", padx=5
+        )
+        ctk.CTkButton(
+            data_controls, text="Import...", width=90,
+            command=lambda: self.import_data(filedialog.askdirectory(parent=panel, title="Import from folder"))
+        ).pack(side="right", padx=5)
+        ctk.CTkButton(
+            data_controls, text="Export...", width=90,
+            command=lambda: self.export_data(
+                filedialog.askdirectory(parent=panel, title="Export to folder"), format_var.get()
+            )
+        ).pack(side="right", padx=5)
+        
+        controls = ctk.CTkFrame(panel)
+        controls.pack(fill="x", padx=20, pady=(10, 10))
+        
+        tracing_var = ctk.BooleanVar(value=tracer.enabled)
+        
+        def toggle_tracing():
+            tracer.enabled = tracing_var.get()
+        
+        ctk.CTkSwitch(
+            controls,
+            text="Record timing spans",
+            variable=tracing_var,
+            command=toggle_tracing
+        ).pack(side="left", padx=10, pady=10)
+        
+        def reset():
+            tracer.reset()
+            render()
+        
+        def export_trace():
+            file_path = "recipe_trace.json"
+            try:
+                tracer.export_chrome_trace(file_path)
+            except OSError as e:
+                self.show_error(f"Failed to export trace: {str(e)}")
+                return
+            self.show_success(f"Trace exported to {file_path} (open it in chrome://tracing or Perfetto)")
+        
+        ctk.CTkButton(controls, text="Export Trace", width=110, command=export_trace).pack(side="right", padx=5)
+        ctk.CTkButton(controls, text="Reset", width=80, command=reset).pack(side="right", padx=5)
+        
+        report = ctk.CTkTextbox(panel, font=ctk.CTkFont(family="Courier", size=12))
+        report.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        
+        def render():
+            report.delete("1.0", "end")
+            histograms = tracer.histograms()
+            if not histograms:
+                report.insert("end", "No spans recorded yet. Turn on recording and use the app.\n")
+            else:
+                report.insert("end", f"{'span':<24}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}\n")
+                for name, stats in histograms.items():
+                    report.insert(
+                        "end",
+                        f"{name:<24}{stats['count']:>8}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}"
+                        f"{stats['p95_ms']:>10.2f}{stats['max_ms']:>10.2f}\n"
+                    )
+            
+            cache = self.response_cache.stats()
+            prefetch = self.prefetcher.stats()
+            revalidation = self.revalidator.stats()
+            photos = self.image_loader.photos.stats()
+            requests = self.scheduler.stats()
+            request_classes = ''.join(
+                f"  {name}: {stats['queued']} queued, {stats['spent']:g} points, {stats['rejected']} refused\n"
+                for name, stats in requests['classes'].items()
+            )
+            report.insert(
+                "end",
+                f"\nResponse cache: {cache['entries']} entries, hit rate {cache['hit_rate']:.0%}\n"
+                f"Prefetch: {prefetch['spent']}/{prefetch['budget']} requests today, {prefetch['queued']} queued\n"
+                f"API quota: {requests['spent']:g}/{requests['daily_quota']:g} points today, "
+                f"{requests['in_flight']} requests in flight\n"
+                f"{request_classes}"
+                f"Deduplicated detail requests: {self.detail_requests.deduplicated}\n"
+                f"API: {'offline' if revalidation['offline'] else 'online'}, "
+                f"{revalidation['refreshed']} stale entries refreshed, {revalidation['pending']} waiting to retry\n"
+                f"Images in memory: {photos['entries']} ({photos['pixels'] / 1e6:.1f}/"
+                f"{photos['max_pixels'] / 1e6:.1f} Mpx), hit rate {photos['hit_rate']:.0%}, "
+                f"{photos['evictions']} evicted\n"
+                f"UI dispatcher backlog: {self.dispatcher.pending}\n"
+            )
+        
+        def refresh():
+            if panel.winfo_exists():
+                render()
+                panel.after(1000, refresh)
+        
+        refresh()
     
     def show_error(self, message: str):
         """Show error message"""
@@ -0,0 +1,61 @@
+"""Benchmark shopping list aggregation on large synthetic meal plans
+
+Usage: python benchmarks/bench_aggregation.py [--lines N] [--repeat R]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shopping_aggregation import aggregate_ingredients  # noqa: E402
+
+UNITS = ['cup', 'cups', 'tbsp', 'Tbsp', 'tsp', 'teaspoons', 'g', 'grams', 'oz', 'lb',
+         'ml', 'clove', 'cloves', 'can', '', 'pinch', 'large']
+AISLES = ['Produce', 'Baking', 'Spices and Seasonings', 'Dairy', 'Meat', 'Canned and Jarred']
+
+
+def make_plan(lines: int, lines_per_recipe: int = 12, vocabulary: int = 300, seed: int = 42):
+    """Build a list of ingredient lists totalling roughly `lines` lines"""
+    rng = random.Random(seed)
+    names = [(1000 + i, f"ingredient {i}", rng.choice(AISLES)) for i in range(vocabulary)]
+    plan = []
+    for _ in range(max(1, lines // lines_per_recipe)):
+        recipe = []
+        for ingredient_id, name, aisle in rng.sample(names, lines_per_recipe):
+            recipe.append({
+                'id': ingredient_id,
+                'name': name,
+                'aisle': aisle,
+                'amount': round(rng.uniform(0.25, 4), 2),
+                'unit': rng.choice(UNITS),
+            })
+        plan.append(recipe)
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    for lines in args.lines:
+        plan = make_plan(lines)
+        total_lines = sum(len(recipe) for recipe in plan)
+        aggregate_ingredients(plan)  # Warm the unit memo
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            items = aggregate_ingredients(plan)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"{total_lines:>6} lines -> {len(items):>5} items: "
+              f"median {timings[len(timings) // 2]:.2f} ms, best {timings[0]:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
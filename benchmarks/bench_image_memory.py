@@ -0,0 +1,169 @@
+"""Measure image decode cost and memory while browsing many recipe cards
+
+Usage: python benchmarks/bench_image_memory.py [--count N] [--cards N] [--json]
+
+The decode section times thumbnail decoding of a stub-sized (556x370) and
+a large (1600x1067) JPEG with and without draft-mode decoding, each in a
+fresh process so peak RSS is comparable. With a display, the browse
+section scrolls through --cards cards, nine visible at a time, and
+reports peak RSS with the bounded PhotoImage cache and with an unbounded
+one.
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SOURCES = {'stub': (556, 370), 'large': (1600, 1067)}
+VISIBLE_CARDS = 9
+
+
+class BytesClient:
+    """Stands in for SpoonacularClient, returning the same image for every URL"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def get_bytes(self, url: str, timeout=None) -> bytes:
+        return self.content
+
+
+def peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def decode_child(source: str, draft: bool, count: int) -> dict:
+    from PIL import Image
+
+    from image_loader import ImageLoader
+    from stub_server import make_image
+
+    content = make_image(SOURCES[source])
+    loader = ImageLoader(BytesClient(content), dispatcher=None, draft=draft)
+    probe = Image.open(io.BytesIO(content))
+    if draft:
+        probe.draft('RGB', loader.size)
+    probe.load()
+
+    baseline = peak_rss_mb()
+    timings = []
+    for index in range(count):
+        start = time.perf_counter()
+        loader._get_thumbnail(f"image-{index}")
+        timings.append((time.perf_counter() - start) * 1000)
+    loader.shutdown()
+    timings.sort()
+    return {
+        'source': f"{SOURCES[source][0]}x{SOURCES[source][1]}",
+        'draft': draft,
+        'decoded_size': f"{probe.size[0]}x{probe.size[1]}",
+        'median_ms': round(timings[len(timings) // 2], 3),
+        'best_ms': round(timings[0], 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'peak_rss_growth_mb': round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def browse_child(cards: int, bounded: bool) -> dict:
+    import customtkinter as ctk
+
+    from image_loader import ImageLoader
+    from stub_server import make_image
+    from ui_dispatcher import UIDispatcher
+
+    root = ctk.CTk()
+    dispatcher = UIDispatcher(root)
+    loader = ImageLoader(BytesClient(make_image()), dispatcher,
+                         max_photo_pixels=100 * 200 * 200 if bounded else 10 ** 12)
+    labels = [ctk.CTkLabel(root, text="") for _ in range(VISIBLE_CARDS)]
+    for label in labels:
+        label.pack()
+    root.update()
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    # Scroll a row of three cards at a time, rebinding the visible labels like the grid does
+    for first in range(0, cards - VISIBLE_CARDS + 1, 3):
+        pending = set(range(first, first + VISIBLE_CARDS))
+
+        def attach(index, photo):
+            label = labels[index % VISIBLE_CARDS]
+            label.configure(image=photo)
+            label.image = photo
+            pending.discard(index)
+
+        for index in list(pending):
+            loader.load(f"image-{index}", lambda photo, index=index: attach(index, photo))
+        while pending:
+            root.update()
+    elapsed = time.perf_counter() - start
+    stats = loader.photos.stats()
+    loader.shutdown()
+    root.destroy()
+    return {
+        'cards': cards,
+        'bounded': bounded,
+        'photos_in_memory': stats['entries'],
+        'seconds': round(elapsed, 2),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'peak_rss_growth_mb': round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def run_child(*args) -> dict:
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', *args],
+                            check=True, capture_output=True, text=True, cwd=REPO_DIR).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200, help='Thumbnails decoded per decode run')
+    parser.add_argument('--cards', type=int, default=1000, help='Cards scrolled through in the browse run')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--child', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        kind, *options = args.child
+        if kind == 'decode':
+            result = decode_child(options[0], options[1] == '1', args.count)
+        else:
+            result = browse_child(args.cards, options[0] == '1')
+        print(json.dumps(result))
+        return
+
+    results = {'decode': [run_child('decode', source, draft, '--count', str(args.count))
+                          for source in SOURCES for draft in ('0', '1')]}
+    if os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin'):
+        results['browse'] = [run_child('browse', bounded, '--cards', str(args.cards)) for bounded in ('1', '0')]
+    else:
+        results['browse'] = {'skipped': 'no display available'}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results['decode']:
+        print(f"decode {result['source']:>9} draft={str(result['draft']):<5} -> {result['decoded_size']:>9}: "
+              f"median {result['median_ms']:.2f} ms, peak RSS {result['peak_rss_mb']} MB")
+    if isinstance(results['browse'], dict):
+        print(f"browse: skipped ({results['browse']['skipped']})")
+    else:
+        for result in results['browse']:
+            print(f"browse {result['cards']} cards, {'bounded' if result['bounded'] else 'unbounded'} cache: "
+                  f"{result['photos_in_memory']} photos kept, peak RSS {result['peak_rss_mb']} MB "
+                  f"(+{result['peak_rss_growth_mb']} MB) in {result['seconds']} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Compare the memory held by raw recipe JSON and the compact recipe models
+
+Usage: python benchmarks/bench_memory.py [--recipes N ...] [--json]
+
+Payloads are round-tripped through JSON so every recipe owns its strings,
+as it does when it arrives from the API or the response cache. Sizes are
+what tracemalloc sees allocated while the objects are alive.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from recipe_models import Recipe  # noqa: E402
+from stub_server import make_recipes  # noqa: E402
+
+
+def search_result(recipe: dict) -> dict:
+    """findByIngredients-shaped result for a recipe, using its first three ingredients"""
+    ingredients = recipe['extendedIngredients']
+    return {
+        'id': recipe['id'],
+        'title': recipe['title'],
+        'image': f"https://img.spoonacular.com/recipes/{recipe['id']}-312x231.jpg",
+        'usedIngredientCount': 3,
+        'missedIngredientCount': len(ingredients) - 3,
+        'usedIngredients': ingredients[:3],
+        'missedIngredients': ingredients[3:],
+        'likes': 0,
+    }
+
+
+def held_bytes(build) -> int:
+    """Bytes still allocated by build()'s result"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def bench(count: int) -> dict:
+    corpus = make_recipes(count)
+    information = [json.dumps(recipe) for recipe in corpus]
+    searches = [json.dumps(search_result(recipe)) for recipe in corpus]
+
+    # Parse outside the measurement so only the kept objects are counted
+    def keep(texts, convert=None):
+        def build():
+            parsed = [json.loads(text) for text in texts]
+            return parsed if convert is None else [convert(data) for data in parsed]
+        return build
+
+    sizes = {
+        'search_results_json': held_bytes(keep(searches)),
+        'search_results_model': held_bytes(keep(searches, Recipe.from_json)),
+        'information_json': held_bytes(keep(information)),
+        'information_model': held_bytes(keep(information, Recipe.from_information)),
+    }
+    results = {'recipes': count}
+    for name, size in sizes.items():
+        results[f"{name}_bytes_per_recipe"] = round(size / count)
+    results['search_results_ratio'] = round(sizes['search_results_json'] / sizes['search_results_model'], 1)
+    results['information_ratio'] = round(sizes['information_json'] / sizes['information_model'], 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = [bench(count) for count in args.recipes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(f"{result['recipes']:>6} recipes:")
+        print(f"  search results  {result['search_results_json_bytes_per_recipe']:>6} B/recipe as JSON, "
+              f"{result['search_results_model_bytes_per_recipe']:>6} B/recipe as Recipe "
+              f"({result['search_results_ratio']}x smaller)")
+        print(f"  /information    {result['information_json_bytes_per_recipe']:>6} B/recipe as JSON, "
+              f"{result['information_model_bytes_per_recipe']:>6} B/recipe as Recipe "
+              f"({result['information_ratio']}x smaller)")
+
+
+if __name__ == '__main__':
+    main()
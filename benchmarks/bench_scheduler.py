@@ -0,0 +1,150 @@
+"""Measure how the request scheduler shares connections and the daily quota
+
+Usage: python benchmarks/bench_scheduler.py [--latency-ms MS] [--flood N] [--json]
+
+Each scenario runs against the local stub, once with a plain client and
+once with a RequestScheduler:
+
+- latency: interactive /information requests sent while --flood batch
+  requests are in progress; reports interactive median and worst latency.
+- fairness: two batch flows (a large one started first and a small one)
+  compete for the connections; reports when the small flow finished.
+- quota: a speculative flood runs against a stub with a 150 point daily
+  quota, then interactive requests are sent; reports how many of them the
+  API still answered.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from request_scheduler import BATCH, INTERACTIVE, SPECULATIVE, RequestScheduler  # noqa: E402
+from spoonacular_client import SpoonacularClient, SpoonacularError  # noqa: E402
+from stub_server import StubSpoonacular  # noqa: E402
+
+FLOOD_THREADS = 32
+
+
+def make_client(stub: StubSpoonacular, scheduled: bool, daily_quota: float = 10 ** 6):
+    scheduler = RequestScheduler(daily_quota=daily_quota) if scheduled else None
+    return SpoonacularClient('bench', base_url=stub.base_url, max_retries=0, pool_size=FLOOD_THREADS,
+                             scheduler=scheduler), scheduler
+
+
+def run_as(scheduler, priority: int, flow: str, fn, *args):
+    if scheduler is None:
+        return fn(*args)
+    with scheduler.priority(priority, flow):
+        return fn(*args)
+
+
+def information(client: SpoonacularClient, recipe_id: int):
+    try:
+        return client.get_json(f"{recipe_id}/information")
+    except SpoonacularError as e:
+        return e
+
+
+def bench_latency(stub: StubSpoonacular, scheduled: bool, flood: int) -> dict:
+    client, scheduler = make_client(stub, scheduled)
+    ids = list(stub.recipes)
+    timings = []
+    with ThreadPoolExecutor(FLOOD_THREADS) as pool:
+        futures = [pool.submit(run_as, scheduler, BATCH, 'flood', information, client, ids[i % len(ids)])
+                   for i in range(flood)]
+        time.sleep(0.05)
+        for index in range(10):
+            start = time.perf_counter()
+            run_as(scheduler, INTERACTIVE, 'details', information, client, ids[index])
+            timings.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.02)
+        for future in futures:
+            future.result()
+    client.close()
+    timings.sort()
+    return {'scheduled': scheduled, 'interactive_median_ms': round(timings[len(timings) // 2], 1),
+            'interactive_worst_ms': round(timings[-1], 1)}
+
+
+def bench_fairness(stub: StubSpoonacular, scheduled: bool, flood: int) -> dict:
+    client, scheduler = make_client(stub, scheduled)
+    ids = list(stub.recipes)
+    small = max(1, flood // 10)
+    finished = {}
+
+    def flow(name: str, count: int):
+        with ThreadPoolExecutor(FLOOD_THREADS) as pool:
+            list(pool.map(lambda i: run_as(scheduler, BATCH, name, information, client, ids[i % len(ids)]),
+                          range(count)))
+        finished[name] = time.perf_counter()
+
+    start = time.perf_counter()
+    large_thread = threading.Thread(target=flow, args=('large', flood))
+    large_thread.start()
+    time.sleep(0.05)
+    small_start = time.perf_counter()
+    flow('small', small)
+    large_thread.join()
+    client.close()
+    return {'scheduled': scheduled, 'small_flow_requests': small,
+            'small_flow_seconds': round(finished['small'] - small_start, 2),
+            'large_flow_seconds': round(finished['large'] - start, 2)}
+
+
+def bench_quota(latency_ms: float, scheduled: bool, flood: int) -> dict:
+    with StubSpoonacular(recipe_count=200, latency_ms=latency_ms, daily_quota=150) as stub:
+        client, scheduler = make_client(stub, scheduled, daily_quota=150)
+        ids = list(stub.recipes)
+        with ThreadPoolExecutor(FLOOD_THREADS) as pool:
+            speculative = list(pool.map(
+                lambda i: run_as(scheduler, SPECULATIVE, 'prefetch', information, client, ids[i % len(ids)]),
+                range(flood)))
+        interactive = [run_as(scheduler, INTERACTIVE, 'details', information, client, ids[i]) for i in range(20)]
+        client.close()
+        return {
+            'scheduled': scheduled,
+            'speculative_sent': flood,
+            'speculative_answered': sum(not isinstance(result, Exception) for result in speculative),
+            'interactive_answered': f"{sum(not isinstance(result, Exception) for result in interactive)}/20",
+            'points_used': stub.quota_used,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--flood', type=int, default=200, help='Requests in each background flood')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    with StubSpoonacular(recipe_count=200, latency_ms=args.latency_ms) as stub:
+        results = {
+            'latency': [bench_latency(stub, scheduled, args.flood) for scheduled in (False, True)],
+            'fairness': [bench_fairness(stub, scheduled, args.flood) for scheduled in (False, True)],
+        }
+    results['quota'] = [bench_quota(args.latency_ms, scheduled, args.flood) for scheduled in (False, True)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results['latency']:
+        print(f"latency  {'scheduler' if result['scheduled'] else 'plain    '}: interactive median "
+              f"{result['interactive_median_ms']} ms, worst {result['interactive_worst_ms']} ms")
+    for result in results['fairness']:
+        print(f"fairness {'scheduler' if result['scheduled'] else 'plain    '}: "
+              f"{result['small_flow_requests']} request flow done in {result['small_flow_seconds']} s, "
+              f"large flow in {result['large_flow_seconds']} s")
+    for result in results['quota']:
+        print(f"quota    {'scheduler' if result['scheduled'] else 'plain    '}: "
+              f"{result['speculative_answered']}/{result['speculative_sent']} speculative answered, "
+              f"{result['interactive_answered']} interactive answered, {result['points_used']:g} points used")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark cold start: module import time and time to first painted frame
+
+Usage: python benchmarks/bench_startup.py [--repeat R] [--json]
+
+Every sample runs in a fresh interpreter so nothing is already imported.
+Time to first frame needs a display and is skipped without one.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = '''
+import sys, time
+start = time.perf_counter()
+import ModernRecipeApp
+elapsed = (time.perf_counter() - start) * 1000
+print(elapsed, int('requests' in sys.modules))
+'''
+
+# Measures from interpreter start to the first idle after the window is mapped
+FIRST_FRAME_PROBE = '''
+import time
+start = time.perf_counter()
+import ModernRecipeApp
+app = ModernRecipeApp.ModernRecipeApp()
+
+def on_map(event):
+    if event.widget is app:
+        app.after_idle(lambda: (print((time.perf_counter() - start) * 1000), app.destroy()))
+
+app.bind("<Map>", on_map, add="+")
+app.mainloop()
+'''
+
+
+def run_probe(source: str) -> str:
+    result = subprocess.run([sys.executable, '-c', source], cwd=REPO_DIR,
+                            capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else 'probe failed')
+    return result.stdout.strip().splitlines()[-1]
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {'median_ms': round(timings[len(timings) // 2], 2), 'best_ms': round(timings[0], 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+
+    import_timings = []
+    requests_loaded = False
+    for _ in range(args.repeat):
+        elapsed, loaded = run_probe(IMPORT_PROBE).split()
+        import_timings.append(float(elapsed))
+        requests_loaded = requests_loaded or loaded == '1'
+    results['import'] = dict(summarize(import_timings), requests_imported=requests_loaded)
+
+    if os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin'):
+        try:
+            results['first_frame'] = summarize(
+                [float(run_probe(FIRST_FRAME_PROBE)) for _ in range(args.repeat)]
+            )
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            results['first_frame'] = {'skipped': str(e)}
+    else:
+        results['first_frame'] = {'skipped': 'no display available'}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:>12}: skipped ({result['skipped']})")
+        else:
+            print(f"{name:>12}: median {result['median_ms']:.1f} ms, best {result['best_ms']:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""End-to-end benchmark suite against a local Spoonacular stand-in
+
+Usage: python benchmarks/bench_suite.py [--latency-ms MS] [--failure-rate F]
+                                        [--meals N ...] [--db-rows N] [--output FILE]
+
+Measures API round trips, image fetch/decode/resize, combined shopping list
+builds for N planned meals and SQLite queries at scale. With a display it
+also drives the app itself for search-to-grid latency, card render time and
+details window open time. Results are written as JSON for comparing releases.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from image_loader import ImageLoader  # noqa: E402
+from ingredient_index import IngredientIndex  # noqa: E402
+from meal_calendar import MealPlanRanges, visible_range  # noqa: E402
+from recipe_cache import ResponseCache  # noqa: E402
+from recipe_models import Recipe  # noqa: E402
+from shopping_list import ShoppingList  # noqa: E402
+from spoonacular_client import SpoonacularClient  # noqa: E402
+from storage import Storage  # noqa: E402
+from stub_server import INGREDIENTS, StubSpoonacular  # noqa: E402
+from thumbnail_cache import ThumbnailCache  # noqa: E402
+
+BULK_CHUNK_SIZE = 100  # Matches the app's informationBulk chunking
+
+
+def measure(fn, repeat: int) -> dict:
+    """Run fn repeatedly and summarize the timings in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+
+def summarize(timings) -> dict:
+    ordered = sorted(timings)
+    return {
+        'samples': len(ordered),
+        'first_ms': round(timings[0], 3),
+        'median_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'best_ms': round(ordered[0], 3),
+    }
+
+
+def bench_api(client: SpoonacularClient, stub: StubSpoonacular, repeat: int, rng: random.Random) -> dict:
+    recipe_ids = list(stub.recipes)
+    return {
+        'search': measure(
+            lambda: client.find_by_ingredients(','.join(rng.sample(INGREDIENTS, 3)), number=12), repeat
+        ),
+        'information': measure(lambda: client.information(rng.choice(recipe_ids)), repeat),
+        'information_bulk_100': measure(
+            lambda: client.information_bulk(rng.sample(recipe_ids, BULK_CHUNK_SIZE)), repeat
+        ),
+    }
+
+
+def bench_images(client: SpoonacularClient, stub: StubSpoonacular, repeat: int, workdir: str) -> dict:
+    urls = [stub.image_url(recipe_id) for recipe_id in list(stub.recipes)[:repeat]]
+    cache = ThumbnailCache(os.path.join(workdir, 'thumbnails'))
+    uncached = ImageLoader(client, dispatcher=None)
+    cached = ImageLoader(client, dispatcher=None, thumbnail_cache=cache)
+    for url in urls:
+        cached._get_thumbnail(url)
+
+    network = iter(urls)
+    disk = iter(urls)
+    results = {
+        'fetch_decode_resize': measure(lambda: uncached._get_thumbnail(next(network)), len(urls)),
+        'thumbnail_cache_hit': measure(lambda: cached._get_thumbnail(next(disk)), len(urls)),
+    }
+    uncached.shutdown()
+    cached.shutdown()
+    return results
+
+
+def bench_shopping_list(client: SpoonacularClient, stub: StubSpoonacular, meal_counts, repeat: int,
+                        workdir: str, rng: random.Random) -> dict:
+    """Open the combined shopping list for N planned meals, as the app does
+
+    cold: no recipe ingredients stored yet, so planned recipes are fetched in
+    bulk chunks and added to the materialized list before it is read.
+    open: every planned recipe is already stored; only the list is read.
+    """
+    recipe_ids = list(stub.recipes)
+    results = {}
+    for meals in meal_counts:
+        storage = Storage(os.path.join(workdir, f"shopping_{meals}.db"))
+        shopping_list = ShoppingList(storage)
+        storage.executemany(
+            "INSERT INTO meal_plans (recipe_id, planned_date, meal_type) VALUES (?, ?, ?)",
+            ((rng.choice(recipe_ids), (date.today() + timedelta(days=i % 365)).isoformat(), 'Dinner')
+             for i in range(meals))
+        )
+
+        def build():
+            missing = shopping_list.planned_without_lines()
+            for start in range(0, len(missing), BULK_CHUNK_SIZE):
+                for recipe in client.information_bulk(missing[start:start + BULK_CHUNK_SIZE]):
+                    shopping_list.add_recipe_information(recipe)
+            return shopping_list.items()
+
+        timings = []
+        for _ in range(repeat):
+            storage.execute("DELETE FROM recipe_shopping_lines")
+            start = time.perf_counter()
+            build()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[f"{meals}_meals_cold"] = summarize(timings)
+        results[f"{meals}_meals_open"] = measure(build, repeat)
+    return results
+
+
+def bench_database(stub: StubSpoonacular, rows: int, repeat: int, workdir: str, rng: random.Random) -> dict:
+    storage = Storage(os.path.join(workdir, 'bench.db'))
+    cache = ResponseCache(storage, max_entries=len(stub.recipes) * 2)
+    index = IngredientIndex(storage)
+    shopping_list = ShoppingList(storage)
+
+    recipes = list(stub.recipes.values())
+    start = time.perf_counter()
+    for recipe in recipes:
+        cache.set('information', {'id': recipe['id']}, recipe)
+        index.add_recipe_information(recipe)
+        shopping_list.add_recipe_information(recipe)
+    seed_ms = (time.perf_counter() - start) * 1000
+
+    today = date.today()
+    storage.executemany(
+        "INSERT OR REPLACE INTO favorites (recipe_id, title, image_url, date_added) VALUES (?, ?, ?, ?)",
+        ((recipe['id'], recipe['title'], recipe['image'], f"{today - timedelta(days=i % 365)} 12:00:00")
+         for i, recipe in enumerate(recipes))
+    )
+    # Planning meals also maintains the materialized shopping list through triggers
+    start = time.perf_counter()
+    storage.executemany(
+        "INSERT INTO meal_plans (recipe_id, planned_date, meal_type) VALUES (?, ?, ?)",
+        ((rng.choice(recipes)['id'], (today + timedelta(days=i % 730)).isoformat(),
+          ('Breakfast', 'Lunch', 'Dinner')[i % 3]) for i in range(rows))
+    )
+    plan_ms = (time.perf_counter() - start) * 1000
+
+    recipe_ids = [recipe['id'] for recipe in recipes]
+    calendar_ranges = MealPlanRanges(storage, executor=None)
+    week_start, week_end = visible_range(today, 'week')
+    results = {
+        'seed_cache_and_index_ms': round(seed_ms, 3),
+        'meal_plan_rows': rows,
+        'meal_plan_insert_ms': round(plan_ms, 3),
+        'favorites_page': measure(lambda: storage.query(
+            "SELECT recipe_id, title, image_url FROM favorites ORDER BY date_added DESC LIMIT ? OFFSET ?",
+            (30, rng.randrange(max(1, len(recipes) - 30)))
+        ), repeat),
+        'meal_plan_full_range': measure(
+            lambda: calendar_ranges.query(today, today + timedelta(days=730)), max(1, repeat // 10)
+        ),
+        'meal_plan_week_range': measure(lambda: calendar_ranges.query(week_start, week_end), repeat),
+        'meal_plan_month_range': measure(lambda: calendar_ranges.query(*visible_range(today, 'month')), repeat),
+        'shopping_list_read': measure(shopping_list.items, repeat),
+        'shopping_list_rebuild': measure(shopping_list.rebuild, max(1, repeat // 10)),
+        'ingredient_index_search': measure(
+            lambda: index.search(','.join(rng.sample(INGREDIENTS, 3)), number=12), repeat
+        ),
+        'response_cache_get': measure(lambda: cache.get('information', {'id': rng.choice(recipe_ids)}), repeat),
+    }
+    return results
+
+
+def pump_until(app, condition, timeout: float = 30):
+    """Run the Tk event loop until condition() holds"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("UI did not settle in time")
+        app.update()
+
+
+def bench_ui(stub: StubSpoonacular, repeat: int, workdir: str, rng: random.Random) -> dict:
+    """Drive the real app window; the database and thumbnails live in workdir"""
+    import ModernRecipeApp
+
+    os.chdir(workdir)
+    app = ModernRecipeApp.ModernRecipeApp()
+    app.client = SpoonacularClient('', stub.base_url)
+    app.finish_startup()
+    app.update()
+
+    def render_card():
+        card = app.create_recipe_card()
+        card.bind_recipe(Recipe.from_json(stub.recipes[rng.choice(list(stub.recipes))]))
+        card.update_idletasks()
+        card.destroy()
+
+    def search_to_grid():
+        app.search_entry.delete(0, 'end')
+        app.search_entry.insert(0, ','.join(rng.sample(INGREDIENTS, 3)))
+        app.search_params = None
+        app.search_recipes()
+        pump_until(app, lambda: app.pending_search_params is None and app.recipe_grid._active
+                   and not app.dispatcher.pending)
+
+    def open_details():
+        recipe_id = rng.choice(list(stub.recipes))
+        app.show_recipe_details(recipe_id)
+        window = app.details_window
+        pump_until(app, lambda: window.recipe is not None and window.recipe.id == recipe_id)
+        window.update_idletasks()
+
+    try:
+        return {
+            'card_render': measure(render_card, repeat),
+            'search_to_grid': measure(search_to_grid, repeat),
+            'details_window_open': measure(open_details, repeat),
+        }
+    finally:
+        app.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=500, help='Size of the stub recipe corpus')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Added to every stub response')
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--failure-rate', type=float, default=0, help='Fraction of requests answered with 503')
+    parser.add_argument('--meals', type=int, nargs='+', default=[7, 21, 100])
+    parser.add_argument('--db-rows', type=int, default=50000, help='Planned meals seeded into the database')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--no-ui', action='store_true', help='Skip benchmarks that need a display')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': vars(args),
+    }
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            StubSpoonacular(recipe_count=args.recipes, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                            failure_rate=args.failure_rate) as stub:
+        # Short backoff so injected failures cost retries, not minutes of sleeping
+        client = SpoonacularClient('', stub.base_url, backoff=0.01, max_backoff=0.05)
+
+        results['api'] = bench_api(client, stub, args.repeat, rng)
+        results['images'] = bench_images(client, stub, args.repeat, workdir)
+        results['shopping_list'] = bench_shopping_list(client, stub, args.meals, args.repeat, workdir, rng)
+        results['database'] = bench_database(stub, args.db_rows, args.repeat, workdir, rng)
+
+        if args.no_ui:
+            results['ui'] = {'skipped': 'disabled with --no-ui'}
+        elif not (os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin')):
+            results['ui'] = {'skipped': 'no display available'}
+        else:
+            cwd = os.getcwd()
+            try:
+                results['ui'] = bench_ui(stub, args.repeat, workdir, rng)
+            except Exception as e:
+                results['ui'] = {'skipped': f"{type(e).__name__}: {e}"}
+            finally:
+                os.chdir(cwd)
+
+        results['stub'] = {'requests': stub.requests_served, 'failures_injected': stub.failures_injected}
+        client.close()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
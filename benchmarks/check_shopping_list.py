@@ -0,0 +1,111 @@
+"""Check the trigger-maintained shopping list against a from-scratch aggregate
+
+Usage: python benchmarks/check_shopping_list.py [--operations N] [--recipes N] [--seed N]
+
+Applies random meal plan inserts, deletes and recipe changes, ingredient
+updates and check-offs to a fresh database, and at every checkpoint
+compares shopping_list_items with aggregate_ingredients over the planned
+meals. Checked-off items must stay checked for as long as some planned
+meal needs them. Exits non-zero on the first mismatch.
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shopping_aggregation import aggregate_ingredients  # noqa: E402
+from shopping_list import ShoppingList  # noqa: E402
+from storage import Storage  # noqa: E402
+from stub_server import make_recipes  # noqa: E402
+
+
+def expected_items(storage: Storage, recipes: dict) -> dict:
+    """item -> (amount, lines, meals) recomputed from the meal plan"""
+    planned = [row[0] for row in storage.query("SELECT recipe_id FROM meal_plans")]
+    expected = {}
+    for recipe_id in planned:
+        for item in aggregate_ingredients([recipes[recipe_id]['extendedIngredients']]):
+            amount, lines, meals = expected.get(item['key'], (0.0, 0, 0))
+            expected[item['key']] = (amount + item['amount'], lines + item['count'], meals + 1)
+    return expected
+
+
+def check(storage: Storage, shopping_list: ShoppingList, recipes: dict, checked: set, step: int):
+    expected = expected_items(storage, recipes)
+    actual = {row[0]: row for row in shopping_list.items()}
+    if set(actual) != set(expected):
+        sys.exit(f"step {step}: items differ: missing {sorted(set(expected) - set(actual))[:5]}, "
+                 f"extra {sorted(set(actual) - set(expected))[:5]}")
+    for item, (amount, lines, meals) in expected.items():
+        row = actual[item]
+        if abs(row[4] - amount) > 1e-6 * max(1.0, abs(amount)) or row[5] != lines or row[6] != meals:
+            sys.exit(f"step {step}: {item} is {row[4:7]}, expected {(amount, lines, meals)}")
+    wrong = {item for item, row in actual.items() if row[7] != (item in checked)}
+    if wrong:
+        sys.exit(f"step {step}: checked state differs for {sorted(wrong)[:5]}")
+
+
+def run(operations: int, recipe_count: int, seed: int):
+    rng = random.Random(seed)
+    recipes = {recipe['id']: recipe for recipe in make_recipes(recipe_count, seed)}
+    storage = Storage(os.path.join(tempfile.mkdtemp(), 'check.db'))
+    shopping_list = ShoppingList(storage)
+    # Ingredients of a quarter of the recipes become known only later, as after an upgrade
+    for recipe_id in list(recipes)[recipe_count // 4:]:
+        shopping_list.add_recipe_information(recipes[recipe_id])
+    checked = set()
+
+    for step in range(1, operations + 1):
+        operation = rng.random()
+        meal_ids = [row[0] for row in storage.query("SELECT id FROM meal_plans")]
+        if operation < 0.35 or not meal_ids:
+            storage.execute("INSERT INTO meal_plans (recipe_id, planned_date, meal_type) VALUES (?, ?, ?)",
+                            (rng.choice(list(recipes)), f"2026-10-{rng.randint(1, 28):02d}", 'Dinner'))
+        elif operation < 0.5:
+            storage.execute("DELETE FROM meal_plans WHERE id = ?", (rng.choice(meal_ids),))
+        elif operation < 0.6:
+            storage.execute("UPDATE meal_plans SET recipe_id = ? WHERE id = ?",
+                            (rng.choice(list(recipes)), rng.choice(meal_ids)))
+        elif operation < 0.85:
+            # A refreshed recipe: one amount changes, sometimes an ingredient is dropped
+            recipe = copy.deepcopy(recipes[rng.choice(list(recipes))])
+            ingredients = recipe['extendedIngredients']
+            rng.choice(ingredients)['amount'] = round(rng.uniform(0.25, 4), 2)
+            if len(ingredients) > 5 and rng.random() < 0.3:
+                ingredients.pop(rng.randrange(len(ingredients)))
+            recipes[recipe['id']] = recipe
+            shopping_list.add_recipe_information(recipe)
+        else:
+            items = shopping_list.items()
+            if items:
+                item = rng.choice(items)[0]
+                value = item not in checked
+                storage.execute("UPDATE shopping_list_items SET checked = ? WHERE item = ?", (int(value), item))
+                (checked.add if value else checked.discard)(item)
+        # Items that leave the list are forgotten, along with their checked state
+        checked &= {row[0] for row in storage.query("SELECT item FROM shopping_list_items")}
+        if step % 50 == 0 or step == operations:
+            # Recipes planned without stored lines don't count until their ingredients are known
+            for recipe_id in shopping_list.planned_without_lines():
+                shopping_list.add_recipe_information(recipes[recipe_id])
+            check(storage, shopping_list, recipes, checked, step)
+    print(f"{operations} operations, {len(shopping_list.items())} items, "
+          f"{len(checked)} checked: consistent at every checkpoint")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', type=int, default=3000)
+    parser.add_argument('--recipes', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    run(args.operations, args.recipes, args.seed)
+
+
+if __name__ == '__main__':
+    main()
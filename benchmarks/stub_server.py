@@ -0,0 +1,280 @@
+"""Local stand-in for the Spoonacular recipe API, for benchmarks
+
+Serves /findByIngredients, /{id}/information, /informationBulk and recipe
+images from fixtures, with configurable latency and failure injection.
+Fixtures are either recorded /information responses (a JSON list) or a
+deterministic synthetic corpus in the same shape.
+
+Usage: python benchmarks/stub_server.py [--port P] [--latency-ms MS] [--failure-rate F]
+"""
+import argparse
+import io
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+AISLES = ['Produce', 'Baking', 'Spices and Seasonings', 'Dairy', 'Meat', 'Canned and Jarred']
+UNITS = ['cup', 'cups', 'tbsp', 'tsp', 'g', 'oz', 'lb', 'ml', 'clove', '', 'pinch']
+INGREDIENTS = ['chicken', 'rice', 'tomato', 'onion', 'garlic', 'flour', 'butter', 'milk', 'egg',
+               'cheese', 'potato', 'carrot', 'beef', 'pasta', 'spinach', 'lemon', 'salt', 'pepper',
+               'olive oil', 'sugar', 'basil', 'mushroom', 'bell pepper', 'cream', 'bacon']
+
+
+def make_recipes(count: int, seed: int = 42) -> List[Dict]:
+    """Build /information payloads for a synthetic recipe corpus"""
+    rng = random.Random(seed)
+    recipes = []
+    for index in range(count):
+        recipe_id = 100000 + index
+        ingredients = []
+        for name in rng.sample(INGREDIENTS, rng.randint(5, 14)):
+            amount = round(rng.uniform(0.25, 4), 2)
+            unit = rng.choice(UNITS)
+            ingredients.append({
+                'id': 1000 + INGREDIENTS.index(name),
+                'name': name,
+                'aisle': AISLES[INGREDIENTS.index(name) % len(AISLES)],
+                'amount': amount,
+                'unit': unit,
+                'original': f"{amount} {unit} {name}".replace('  ', ' '),
+            })
+        recipes.append({
+            'id': recipe_id,
+            'title': f"{ingredients[0]['name'].title()} and {ingredients[1]['name']} dish {index}",
+            'readyInMinutes': rng.choice([15, 20, 30, 45, 60, 90]),
+            'servings': rng.randint(1, 8),
+            'vegetarian': rng.random() < 0.3,
+            'vegan': rng.random() < 0.1,
+            'glutenFree': rng.random() < 0.3,
+            'extendedIngredients': ingredients,
+            'instructions': '<ol>' + ''.join(f"<li>Step {step} of the method.</li>" for step in range(1, 9)) + '</ol>',
+            'nutrition': {'nutrients': [
+                {'name': name, 'amount': round(rng.uniform(1, 800), 1), 'unit': unit}
+                for name, unit in [('Calories', 'kcal'), ('Fat', 'g'), ('Carbohydrates', 'g'),
+                                   ('Protein', 'g'), ('Sugar', 'g'), ('Sodium', 'mg')]
+            ]},
+        })
+    return recipes
+
+
+def make_image(size=(556, 370)) -> bytes:
+    """Encode one JPEG the size of a Spoonacular recipe image"""
+    from PIL import Image
+
+    img = Image.radial_gradient('L').resize(size).convert('RGB')
+    out = io.BytesIO()
+    img.save(out, format='JPEG', quality=85)
+    return out.getvalue()
+
+
+class StubSpoonacular:
+    """Threaded HTTP server answering Spoonacular-shaped requests locally
+
+    latency_ms (plus up to jitter_ms) is added to every response, and a
+    failure_rate fraction of requests answers failure_status instead.
+    Setting online to False drops every connection without a response, as
+    when the API is unreachable. With a daily_quota, API responses carry
+    Spoonacular's X-API-Quota-* headers and requests beyond the quota are
+    answered with 402.
+    """
+
+    def __init__(self, recipes: Optional[List[Dict]] = None, recipe_count: int = 500,
+                 latency_ms: float = 0, jitter_ms: float = 0, failure_rate: float = 0,
+                 failure_status: int = 503, host: str = '127.0.0.1', port: int = 0, seed: int = 42,
+                 daily_quota: Optional[float] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.daily_quota = daily_quota
+        self.quota_used = 0.0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests_served = 0
+        self.failures_injected = 0
+        self.online = True
+
+        self.image = make_image()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+            disable_nagle_algorithm = True  # Otherwise delayed ACKs add ~40 ms per response
+
+            def do_GET(self):
+                stub._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+        # Every recipe image is served by the stub, including recorded ones
+        self.recipes = {
+            recipe['id']: dict(recipe, image=self.image_url(recipe['id']))
+            for recipe in (recipes or make_recipes(recipe_count, seed))
+        }
+
+    @property
+    def root_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.root_url}/recipes"
+
+    def image_url(self, recipe_id: int) -> str:
+        return f"{self.root_url}/images/{recipe_id}.jpg"
+
+    def start(self) -> 'StubSpoonacular':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True, name='stub-server')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        if not self.online:
+            handler.close_connection = True
+            handler.connection.shutdown(socket.SHUT_RDWR)
+            return
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures_injected += 1
+        if delay:
+            time.sleep(delay / 1000)
+
+        if fail:
+            self._send(handler, self.failure_status, b'{"status": "failure"}', 'application/json')
+            return
+
+        url = urlparse(handler.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip('/')
+
+        match = re.fullmatch(r'/images/(\d+)\.jpg', path)
+        if match:
+            self._send(handler, 200, self.image, 'image/jpeg')
+            return
+
+        if self.daily_quota is not None and self.quota_used >= self.daily_quota:
+            self._send(handler, 402, b'{"status": "failure", "code": 402}', 'application/json')
+            return
+
+        if path == '/recipes/findByIngredients':
+            body = self._find_by_ingredients(query)
+            points = 1 + 0.01 * len(body)
+        elif path == '/recipes/informationBulk':
+            ids = [int(value) for value in query.get('ids', '').split(',') if value.strip().isdigit()]
+            body = [self.recipes[recipe_id] for recipe_id in ids if recipe_id in self.recipes]
+            points = 1 + 0.5 * max(0, len(body) - 1)
+        else:
+            match = re.fullmatch(r'/recipes/(\d+)/information', path)
+            recipe = self.recipes.get(int(match.group(1))) if match else None
+            if recipe is None:
+                self._send(handler, 404, b'{"status": "failure", "code": 404}', 'application/json')
+                return
+            body = recipe
+            points = 1
+
+        headers = {}
+        if self.daily_quota is not None:
+            with self._lock:
+                self.quota_used += points
+                headers = {
+                    'X-API-Quota-Request': f"{points:g}",
+                    'X-API-Quota-Used': f"{self.quota_used:g}",
+                    'X-API-Quota-Left': f"{max(0.0, self.daily_quota - self.quota_used):g}",
+                }
+        self._send(handler, 200, json.dumps(body).encode('utf-8'), 'application/json', headers)
+
+    def _find_by_ingredients(self, query: Dict[str, str]) -> List[Dict]:
+        wanted = {name.strip().lower() for name in query.get('ingredients', '').split(',') if name.strip()}
+        number = int(query.get('number', 10))
+        max_ready_time = int(query.get('maxReadyTime', 0))
+
+        results = []
+        for recipe in self.recipes.values():
+            if max_ready_time and recipe.get('readyInMinutes', 0) > max_ready_time:
+                continue
+            used = [ingredient for ingredient in recipe['extendedIngredients']
+                    if ingredient['name'].lower() in wanted]
+            if not used:
+                continue
+            missed = [ingredient for ingredient in recipe['extendedIngredients'] if ingredient not in used]
+            results.append({
+                'id': recipe['id'],
+                'title': recipe['title'],
+                'image': recipe['image'],
+                'usedIngredientCount': len(used),
+                'missedIngredientCount': len(missed),
+                'usedIngredients': used,
+                'missedIngredients': missed,
+            })
+        results.sort(key=lambda result: (result['missedIngredientCount'], -result['usedIngredientCount']))
+        return results[:number]
+
+    @staticmethod
+    def _send(handler: BaseHTTPRequestHandler, status: int, body: bytes, content_type: str,
+              headers: Optional[Dict[str, str]] = None):
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--recipes', type=int, default=500, help='Size of the synthetic corpus')
+    parser.add_argument('--fixtures', help='JSON list of recorded /information responses')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--failure-rate', type=float, default=0)
+    parser.add_argument('--failure-status', type=int, default=503)
+    parser.add_argument('--daily-quota', type=float, help='Send quota headers and answer 402 past this many points')
+    args = parser.parse_args()
+
+    recipes = None
+    if args.fixtures:
+        with open(args.fixtures, encoding='utf-8') as f:
+            recipes = json.load(f)
+
+    stub = StubSpoonacular(recipes, recipe_count=args.recipes, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, failure_rate=args.failure_rate,
+                           failure_status=args.failure_status, port=args.port, daily_quota=args.daily_quota)
+    with stub:
+        print(f"Serving Spoonacular stub at {stub.base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import csv
+import json
+import os
+from datetime import date
+from itertools import islice
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence
+
+from storage import Storage
+
+FORMATS = ('jsonl', 'csv')
+
+
+class Dataset:
+    """How one kind of record is read from and written to the database"""
+
+    def __init__(self, name: str, select_sql: str, columns: Sequence[str], insert_sql: str,
+                 to_params: Optional[Callable[[Sequence], Sequence]] = None,
+                 occurrence_key: Optional[Callable[[Sequence], Hashable]] = None):
+        self.name = name
+        self.select_sql = select_sql
+        self.columns = tuple(columns)
+        self.insert_sql = insert_sql
+        self.to_params = to_params
+        # When set, each row's params get its 1-based occurrence number among rows with the same key
+        self.occurrence_key = occurrence_key
+
+    def filename(self, fmt: str) -> str:
+        return f"{self.name}.{fmt}"
+
+
+def _meal_plan_params(row: Sequence) -> Sequence:
+    try:
+        planned_date = date.fromisoformat(row[1]).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid planned_date {row[1]!r} for recipe {row[0]} (expected YYYY-MM-DD)") from None
+    return (row[0], planned_date, row[2])
+
+
+DATASETS: Dict[str, Dataset] = {dataset.name: dataset for dataset in [
+    Dataset(
+        'favorites',
+        "SELECT recipe_id, title, image_url, date_added FROM favorites",
+        ('recipe_id', 'title', 'image_url', 'date_added'),
+        "INSERT OR REPLACE INTO favorites (recipe_id, title, image_url, date_added) VALUES (?, ?, ?, ?)",
+    ),
+    Dataset(
+        'meal_plans',
+        "SELECT recipe_id, planned_date, meal_type FROM meal_plans ORDER BY planned_date, meal_type",
+        ('recipe_id', 'planned_date', 'meal_type'),
+        # The same recipe may be planned twice for one meal; the nth copy in a file is only
+        # inserted while fewer than n are planned, so re-importing a file is harmless
+        '''INSERT INTO meal_plans (recipe_id, planned_date, meal_type)
+           SELECT ?1, ?2, ?3 WHERE (
+               SELECT COUNT(*) FROM meal_plans WHERE planned_date = ?2 AND meal_type = ?3 AND recipe_id = ?1
+           ) < ?4''',
+        to_params=_meal_plan_params,
+        occurrence_key=tuple,
+    ),
+    Dataset(
+        'recipe_cache',
+        "SELECT cache_key, endpoint, response, created_at, last_access FROM api_cache",
+        ('cache_key', 'endpoint', 'response', 'created_at', 'last_access'),
+        '''INSERT OR REPLACE INTO api_cache (cache_key, endpoint, response, created_at, last_access)
+           VALUES (?, ?, ?, ?, ?)''',
+    ),
+]}
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension == 'csv':
+        return 'csv'
+    raise ValueError(f"Unsupported file type: {path} (use .jsonl or .csv)")
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[List]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_dataset(storage: Storage, dataset: Dataset, path: str, fmt: Optional[str] = None,
+                   chunk_size: int = 1000) -> int:
+    """Stream a dataset to a JSON Lines or CSV file; returns the row count"""
+    fmt = fmt or detect_format(path)
+    count = 0
+    # Write to a temp file first so a failed export never leaves a truncated file behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        rows = storage.iterate(dataset.select_sql, chunk_size=chunk_size)
+        if fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(dataset.columns)
+            for chunk in _chunks(rows, chunk_size):
+                writer.writerows(chunk)
+                count += len(chunk)
+        else:
+            columns = dataset.columns
+            for chunk in _chunks(rows, chunk_size):
+                f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in chunk)
+                count += len(chunk)
+    os.replace(tmp_path, path)
+    return count
+
+
+def _read_rows(dataset: Dataset, path: str, fmt: str) -> Iterator[tuple]:
+    """Yield rows in the dataset's column order, one line at a time"""
+    columns = dataset.columns
+    with open(path, encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            positions = [header.index(column) for column in columns]
+            for record in reader:
+                # CSV has no NULL; empty fields become NULL again
+                yield tuple(record[position] or None for position in positions)
+        else:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield tuple(record.get(column) for column in columns)
+
+
+def import_dataset(storage: Storage, dataset: Dataset, path: str, fmt: Optional[str] = None,
+                   chunk_size: int = 1000) -> int:
+    """Stream a JSON Lines or CSV file into the database; returns the rows inserted
+
+    Rows are inserted with one executemany per chunk, all in one transaction,
+    so a bad file leaves the database unchanged.
+    """
+    fmt = fmt or detect_format(path)
+    rows = _read_rows(dataset, path, fmt)
+    if dataset.to_params is not None:
+        rows = map(dataset.to_params, rows)
+    if dataset.occurrence_key is not None:
+        rows = _number_occurrences(rows, dataset.occurrence_key)
+
+    count = 0
+    with storage.transaction() as conn:
+        for chunk in _chunks(rows, chunk_size):
+            # rowcount leaves out skipped rows and changes made by triggers
+            count += conn.executemany(dataset.insert_sql, chunk).rowcount
+    return count
+
+
+def _number_occurrences(rows: Iterable[Sequence], key: Callable[[Sequence], Hashable]) -> Iterator[Sequence]:
+    seen: Dict[Hashable, int] = {}
+    for row in rows:
+        occurrence = seen[key(row)] = seen.get(key(row), 0) + 1
+        yield tuple(row) + (occurrence,)
+
+
+def export_all(storage: Storage, directory: str, fmt: str = 'jsonl') -> Dict[str, int]:
+    """Export every dataset into a directory, one file each"""
+    os.makedirs(directory, exist_ok=True)
+    return {
+        name: export_dataset(storage, dataset, os.path.join(directory, dataset.filename(fmt)), fmt)
+        for name, dataset in DATASETS.items()
+    }
+
+
+def import_all(storage: Storage, directory: str) -> Dict[str, int]:
+    """Import every dataset file found in a directory, in either format"""
+    counts = {}
+    for name, dataset in DATASETS.items():
+        for fmt in FORMATS:
+            path = os.path.join(directory, dataset.filename(fmt))
+            if os.path.exists(path):
+                counts[name] = counts.get(name, 0) + import_dataset(storage, dataset, path, fmt)
+    return counts
@@ -0,0 +1,166 @@
+import io
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from thumbnail_cache import ThumbnailCache
+from tracing import tracer
+
+
+class PhotoCache:
+    """Least recently used PhotoImages by URL, capped by their total pixel count
+
+    Tk keeps every PhotoImage as a full RGBA bitmap, so the pixel count is
+    what bounds memory. Images evicted while a card still shows them live
+    on until the card lets go. Only used from the Tk thread.
+    """
+
+    def __init__(self, max_pixels: int = 100 * 200 * 200):
+        self.max_pixels = max_pixels
+        self._photos: "OrderedDict[str, ImageTk.PhotoImage]" = OrderedDict()
+        self.pixels = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional["ImageTk.PhotoImage"]:
+        photo = self._photos.get(url)
+        if photo is None:
+            self.misses += 1
+            return None
+        self._photos.move_to_end(url)
+        self.hits += 1
+        return photo
+
+    def put(self, url: str, photo: "ImageTk.PhotoImage"):
+        old = self._photos.pop(url, None)
+        if old is not None:
+            self.pixels -= old.width() * old.height()
+        self._photos[url] = photo
+        self.pixels += photo.width() * photo.height()
+        while self.pixels > self.max_pixels and len(self._photos) > 1:
+            _, evicted = self._photos.popitem(last=False)
+            self.pixels -= evicted.width() * evicted.height()
+            self.evictions += 1
+
+    def clear(self):
+        self._photos.clear()
+        self.pixels = 0
+
+    def stats(self) -> Dict[str, int]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._photos),
+            'pixels': self.pixels,
+            'max_pixels': self.max_pixels,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+
+class ImageLoader:
+    """Download and resize recipe images on a bounded thread pool
+
+    Finished PhotoImages are kept in a PhotoCache, so cards scrolled back
+    into view are rebuilt from memory, then the disk cache, then the network.
+    """
+
+    def __init__(self, client, dispatcher, max_workers: int = 6, size: Tuple[int, int] = (200, 200),
+                 timeout: float = 10, thumbnail_cache: Optional[ThumbnailCache] = None,
+                 max_photo_pixels: int = 100 * 200 * 200, draft: bool = True):
+        self.client = client
+        self.dispatcher = dispatcher
+        self.thumbnail_cache = thumbnail_cache
+        self.size = size
+        self.timeout = timeout
+        self.draft = draft
+        self.photos = PhotoCache(max_photo_pixels)
+        self._waiting: Dict[str, List[Callable]] = {}  # URL -> callbacks of an in-flight load
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-loader')
+        # One worker of its own, so warming never delays images a card is waiting on
+        self.warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-warm')
+
+    def load(self, url: str, callback: Callable[[Optional["ImageTk.PhotoImage"]], None]):
+        """Fetch an image in the background; callback runs on the Tk thread
+
+        Call from the Tk thread. Images still in memory are handed to the
+        callback immediately.
+        """
+        photo = self.photos.get(url)
+        if photo is not None:
+            callback(photo)
+            return
+        waiting = self._waiting.get(url)
+        if waiting is not None:
+            waiting.append(callback)
+            return
+        self._waiting[url] = [callback]
+        self.executor.submit(self._fetch, url)
+
+    def warm(self, urls: Iterable[str]):
+        """Download thumbnails missing from the disk cache in the background"""
+        if self.thumbnail_cache is None:
+            return
+        for url in urls:
+            if url and url not in self._waiting and url not in self.thumbnail_cache:
+                self.warm_executor.submit(self._warm, url)
+
+    def _warm(self, url: str):
+        # A card may have loaded it while this waited its turn
+        if url not in self._waiting and url not in self.thumbnail_cache:
+            self._get_thumbnail(url)
+
+    def _get_thumbnail(self, url: str) -> Optional["Image.Image"]:
+        """Return a resized thumbnail from the disk cache or the network"""
+        from PIL import Image  # Imported on first use to keep startup fast
+
+        if self.thumbnail_cache is not None:
+            with tracer.span('image.cache_get', 'image'):
+                img = self.thumbnail_cache.get(url)
+            if img is not None:
+                return img
+
+        try:
+            # Downloads share the client's keep-alive connection pool
+            with tracer.span('image.fetch', 'image', url=url):
+                content = self.client.get_bytes(url, timeout=self.timeout)
+            with tracer.span('image.decode', 'image'):
+                img = Image.open(io.BytesIO(content))
+                if self.draft:
+                    # Let the JPEG decoder scale down by 1/2, 1/4 or 1/8 while
+                    # staying at least as large as the thumbnail
+                    img.draft('RGB', self.size)
+                img.load()
+            with tracer.span('image.resize', 'image'):
+                img = img.resize(self.size, Image.Resampling.LANCZOS)
+        except Exception:
+            return None
+
+        if self.thumbnail_cache is not None:
+            with tracer.span('image.cache_put', 'image'):
+                self.thumbnail_cache.put(url, img)
+        return img
+
+    def _fetch(self, url: str):
+        self.dispatcher.post(self._attach, url, self._get_thumbnail(url))
+
+    def _attach(self, url: str, img: Optional["Image.Image"]):
+        """PhotoImage must be created on the Tk thread"""
+        from PIL import ImageTk
+
+        callbacks = self._waiting.pop(url, [])
+        photo = None
+        if img is not None:
+            with tracer.span('image.photo', 'image'):
+                photo = ImageTk.PhotoImage(img)
+            self.photos.put(url, photo)
+        for callback in callbacks:
+            try:
+                callback(photo)
+            except Exception:
+                pass  # The card may have been destroyed meanwhile
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.warm_executor.shutdown(wait=False, cancel_futures=True)
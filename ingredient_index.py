@@ -0,0 +1,159 @@
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+
+from storage import Storage
+
+# Diet filter value -> indexed_recipes column
+DIET_COLUMNS = {
+    'vegetarian': 'vegetarian',
+    'vegan': 'vegan',
+    'gluten-free': 'gluten_free',
+}
+
+
+def normalize_ingredient(name: str) -> str:
+    return ' '.join(name.lower().split())
+
+
+class IngredientIndex:
+    """Local inverted index (ingredient -> recipe ids) over every recipe seen"""
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+        # Full-text matching of ingredient names, with a LIKE fallback
+        # for SQLite builds compiled without FTS5
+        self.has_fts = self.storage.query_one(
+            "SELECT 1 FROM sqlite_master WHERE name = 'ingredient_fts'"
+        ) is not None
+
+    def add_recipe_information(self, recipe: Dict):
+        """Index a full /information payload"""
+        ingredients = [ingredient['name'] for ingredient in recipe.get('extendedIngredients', [])
+                       if ingredient.get('name')]
+        self._upsert(
+            recipe['id'], recipe.get('title'), recipe.get('image'), ingredients,
+            ready_in_minutes=recipe.get('readyInMinutes'),
+            servings=recipe.get('servings'),
+            vegetarian=recipe.get('vegetarian'),
+            vegan=recipe.get('vegan'),
+            gluten_free=recipe.get('glutenFree'),
+        )
+
+    def add_search_results(self, recipes: Iterable[Dict]):
+        """Index /findByIngredients results (used + missed make up the full list)"""
+        for recipe in recipes:
+            ingredients = [ingredient['name']
+                           for ingredient in recipe.get('usedIngredients', []) + recipe.get('missedIngredients', [])
+                           if ingredient.get('name')]
+            self._upsert(recipe['id'], recipe.get('title'), recipe.get('image'), ingredients)
+
+    def _upsert(self, recipe_id: int, title: Optional[str], image: Optional[str], ingredients: List[str],
+                **details):
+        names = sorted({normalize_ingredient(name) for name in ingredients})
+        if not names:
+            return
+
+        flags = {key: (None if value is None else int(value)) for key, value in details.items()}
+        with self.storage.transaction() as conn:
+            # Keep richer details from /information when a search result is re-indexed
+            conn.execute('''
+                INSERT INTO indexed_recipes (recipe_id, title, image, ready_in_minutes, servings,
+                                             vegetarian, vegan, gluten_free, ingredient_count, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (recipe_id) DO UPDATE SET
+                    title = COALESCE(excluded.title, title),
+                    image = COALESCE(excluded.image, image),
+                    ready_in_minutes = COALESCE(excluded.ready_in_minutes, ready_in_minutes),
+                    servings = COALESCE(excluded.servings, servings),
+                    vegetarian = COALESCE(excluded.vegetarian, vegetarian),
+                    vegan = COALESCE(excluded.vegan, vegan),
+                    gluten_free = COALESCE(excluded.gluten_free, gluten_free),
+                    ingredient_count = excluded.ingredient_count,
+                    updated_at = excluded.updated_at
+            ''', (recipe_id, title, image, flags.get('ready_in_minutes'), flags.get('servings'),
+                  flags.get('vegetarian'), flags.get('vegan'), flags.get('gluten_free'),
+                  len(names), time.time()))
+
+            conn.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ?", (recipe_id,))
+            conn.executemany(
+                "INSERT INTO recipe_ingredients (ingredient, recipe_id) VALUES (?, ?)",
+                [(name, recipe_id) for name in names]
+            )
+
+            for name in names:
+                cur = conn.execute("INSERT OR IGNORE INTO ingredient_names (name) VALUES (?)", (name,))
+                if cur.rowcount and self.has_fts:
+                    conn.execute("INSERT INTO ingredient_fts (name) VALUES (?)", (name,))
+
+    def _match_names(self, term: str) -> List[str]:
+        """Return indexed ingredient names matching a query term"""
+        tokens = re.findall(r'\w+', term)
+        if not tokens:
+            return []
+        if self.has_fts:
+            query = ' '.join(f'"{token}"' for token in tokens)
+            rows = self.storage.query(
+                "SELECT name FROM ingredient_fts WHERE ingredient_fts MATCH ?", (query,)
+            )
+        else:
+            rows = self.storage.query(
+                "SELECT name FROM ingredient_names WHERE name LIKE ?", (f"%{term}%",)
+            )
+        return [row[0] for row in rows]
+
+    def search(self, ingredients: str, number: int = 9, offset: int = 0, diet: Optional[str] = None,
+               max_ready_time: Optional[int] = None) -> List[Dict]:
+        """Rank indexed recipes like findByIngredients with ranking=2
+
+        Recipes with the fewest missing ingredients come first, ties broken by
+        the most used ingredients. Results have the same shape as the API's.
+        """
+        terms = [normalize_ingredient(term) for term in ingredients.split(',') if term.strip()]
+        matched_names = set()
+        for term in terms:
+            matched_names.update(self._match_names(term))
+        if not matched_names:
+            return []
+
+        conditions = []
+        params = list(matched_names)
+        if diet and diet in DIET_COLUMNS:
+            conditions.append(f"r.{DIET_COLUMNS[diet]} = 1")
+        if max_ready_time:
+            conditions.append("r.ready_in_minutes <= ?")
+            params.append(max_ready_time)
+        where = ''.join(f" AND {condition}" for condition in conditions)
+        params.extend((number, offset))
+
+        # Count, filter and rank in one indexed query
+        rows = self.storage.query(f'''
+            SELECT r.recipe_id, r.title, r.image, r.ready_in_minutes, r.servings,
+                   COUNT(*) AS used, r.ingredient_count - COUNT(*) AS missed,
+                   group_concat(ri.ingredient, '|')
+            FROM recipe_ingredients ri
+            JOIN indexed_recipes r ON r.recipe_id = ri.recipe_id
+            WHERE ri.ingredient IN ({','.join('?' * len(matched_names))}){where}
+            GROUP BY ri.recipe_id
+            ORDER BY missed, used DESC, r.recipe_id
+            LIMIT ? OFFSET ?
+        ''', params)
+
+        return [
+            {
+                'id': recipe_id,
+                'title': title,
+                'image': image,
+                'readyInMinutes': ready,
+                'servings': servings,
+                'usedIngredientCount': used,
+                'missedIngredientCount': missed,
+                'usedIngredients': [{'name': name} for name in used_names.split('|')],
+            }
+            for recipe_id, title, image, ready, servings, used, missed, used_names in rows
+        ]
+
+    def is_indexed(self, recipe_id: int) -> bool:
+        return self.storage.query_one(
+            "SELECT 1 FROM indexed_recipes WHERE recipe_id = ?", (recipe_id,)
+        ) is not None
@@ -0,0 +1,243 @@
+import calendar
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import customtkinter as ctk
+
+from storage import Storage
+
+# Display order of meals within a day
+MEAL_ORDER = {'Breakfast': 0, 'Lunch': 1, 'Dinner': 2, 'Snack': 3}
+
+MONTH_WEEKS = 6  # A month grid always shows six weeks so the cell count is fixed
+
+# date -> [(meal_type, title, recipe_id)]
+DayMeals = Dict[str, List[Tuple[str, str, int]]]
+
+
+def visible_range(anchor: date, mode: str) -> Tuple[date, date]:
+    """First and last day shown by the calendar for an anchor date"""
+    if mode == 'week':
+        start = anchor - timedelta(days=anchor.weekday())
+        return start, start + timedelta(days=6)
+    first = anchor.replace(day=1)
+    start = first - timedelta(days=first.weekday())
+    return start, start + timedelta(days=7 * MONTH_WEEKS - 1)
+
+
+def shift_anchor(anchor: date, mode: str, steps: int) -> date:
+    """Move the anchor by whole weeks or months"""
+    if mode == 'week':
+        return anchor + timedelta(weeks=steps)
+    month_index = anchor.year * 12 + anchor.month - 1 + steps
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class MealPlanRanges:
+    """Planned meals by date range, keeping recently loaded ranges in memory
+
+    Each range is one indexed query on planned_date. Titles come from the
+    recipe metadata in indexed_recipes, so planned recipes that are not
+    favorites are still shown, falling back to the favorite's title for
+    recipes not indexed yet.
+    """
+
+    def __init__(self, storage: Storage, executor: Executor, max_ranges: int = 12):
+        self.storage = storage
+        self.executor = executor
+        self.max_ranges = max_ranges
+        self._lock = threading.Lock()
+        self._ranges: "OrderedDict[Tuple[str, str], DayMeals]" = OrderedDict()
+        self._version = 0
+
+    def query(self, start: date, end: date) -> DayMeals:
+        rows = self.storage.query('''
+            SELECT mp.planned_date, mp.meal_type, COALESCE(r.title, f.title, 'Recipe ' || mp.recipe_id),
+                   mp.recipe_id
+            FROM meal_plans mp
+            LEFT JOIN indexed_recipes r ON r.recipe_id = mp.recipe_id
+            LEFT JOIN favorites f ON f.recipe_id = mp.recipe_id
+            WHERE mp.planned_date BETWEEN ? AND ?
+        ''', (start.isoformat(), end.isoformat()))
+        meals: DayMeals = {}
+        for planned_date, meal_type, title, recipe_id in rows:
+            meals.setdefault(planned_date, []).append((meal_type, title, recipe_id))
+        for day_meals in meals.values():
+            day_meals.sort(key=lambda meal: (MEAL_ORDER.get(meal[0], len(MEAL_ORDER)), meal[1]))
+        return meals
+
+    def get(self, start: date, end: date):
+        """Return a loaded range, or None if it is not in memory"""
+        key = (start.isoformat(), end.isoformat())
+        with self._lock:
+            meals = self._ranges.get(key)
+            if meals is not None:
+                self._ranges.move_to_end(key)
+            return meals
+
+    def load(self, start: date, end: date,
+             callback: Optional[Callable[[Optional[DayMeals], Optional[Exception]], None]] = None):
+        """Load a range on the executor
+
+        callback(meals, error) runs on the worker thread; meals is None on error.
+        """
+        self.executor.submit(self._load, start, end, callback)
+
+    def prefetch(self, ranges: List[Tuple[date, date]]):
+        for start, end in ranges:
+            if self.get(start, end) is None:
+                self.load(start, end)
+
+    def invalidate(self):
+        """Forget loaded ranges after the meal plan changes"""
+        with self._lock:
+            self._ranges.clear()
+            self._version += 1
+
+    def _load(self, start: date, end: date, callback):
+        meals = self.get(start, end)
+        if meals is None:
+            with self._lock:
+                version = self._version
+            try:
+                meals = self.query(start, end)
+            except Exception as e:
+                if callback is not None:
+                    callback(None, e)
+                return
+            with self._lock:
+                # Results that raced with an invalidation are used once but not kept
+                if version == self._version:
+                    self._ranges[(start.isoformat(), end.isoformat())] = meals
+                    while len(self._ranges) > self.max_ranges:
+                        self._ranges.popitem(last=False)
+        if callback is not None:
+            callback(meals, None)
+
+
+class DayCell(ctk.CTkFrame):
+    """One calendar day; rebound to another date when the calendar pages"""
+
+    def __init__(self, master):
+        super().__init__(master, corner_radius=6)
+        self.day_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(weight="bold"), anchor="w")
+        self.day_label.pack(fill="x", padx=6, pady=(4, 0))
+        self.meals_label = ctk.CTkLabel(self, text="", justify="left", anchor="nw", wraplength=130)
+        self.meals_label.pack(fill="both", expand=True, padx=6, pady=(0, 4))
+
+    def bind_day(self, day: date, in_month: bool, today: bool):
+        self.day_label.configure(
+            text=f"{day.day}" if not today else f"{day.day} • Today",
+            text_color=("gray10", "gray90") if in_month else ("gray60", "gray45")
+        )
+        self.meals_label.configure(text="")
+
+    def bind_meals(self, meals: List[Tuple[str, str, int]]):
+        self.meals_label.configure(text="\n".join(f"{meal_type}: {title}" for meal_type, title, _ in meals))
+
+
+class MealCalendar(ctk.CTkFrame):
+    """Week/month meal plan calendar over a fixed set of reusable day cells"""
+
+    def __init__(self, master, ranges: MealPlanRanges, dispatcher, mode: str = 'week',
+                 on_error: Optional[Callable[[str], None]] = None):
+        super().__init__(master)
+        self.ranges = ranges
+        self.dispatcher = dispatcher
+        self.on_error = on_error
+        self.mode = mode
+        self.anchor = date.today()
+        self._generation = 0
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", padx=10, pady=(10, 5))
+        ctk.CTkButton(header, text="◀", width=36, command=lambda: self.page(-1)).pack(side="left")
+        ctk.CTkButton(header, text="Today", width=70, command=self.go_to_today).pack(side="left", padx=5)
+        ctk.CTkButton(header, text="▶", width=36, command=lambda: self.page(1)).pack(side="left")
+        self.title_label = ctk.CTkLabel(header, text="", font=ctk.CTkFont(size=18, weight="bold"))
+        self.title_label.pack(side="left", padx=15)
+        self.mode_var = ctk.StringVar(value=mode.title())
+        ctk.CTkSegmentedButton(
+            header,
+            values=["Week", "Month"],
+            variable=self.mode_var,
+            command=lambda value: self.set_mode(value.lower())
+        ).pack(side="right")
+        self.header = header
+
+        grid = ctk.CTkFrame(self, fg_color="transparent")
+        grid.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        for column, name in enumerate(calendar.day_abbr):
+            grid.grid_columnconfigure(column, weight=1, uniform="day")
+            ctk.CTkLabel(grid, text=name).grid(row=0, column=column)
+
+        # Every cell is built once; paging only rebinds them
+        self.cells = [DayCell(grid) for _ in range(7 * MONTH_WEEKS)]
+        for index, cell in enumerate(self.cells):
+            cell.grid(row=index // 7 + 1, column=index % 7, padx=3, pady=3, sticky="nsew")
+
+        self.show()
+
+    def set_mode(self, mode: str):
+        self.mode = mode
+        self.show()
+
+    def page(self, steps: int):
+        self.anchor = shift_anchor(self.anchor, self.mode, steps)
+        self.show()
+
+    def go_to_today(self):
+        self.anchor = date.today()
+        self.show()
+
+    def refresh(self):
+        """Reload the visible range, e.g. after the meal plan changed"""
+        self.show()
+
+    def show(self):
+        self._generation += 1
+        generation = self._generation
+        start, end = visible_range(self.anchor, self.mode)
+        today = date.today()
+
+        if self.mode == 'week':
+            self.title_label.configure(text=f"Week of {start.strftime('%b %d, %Y')}")
+        else:
+            self.title_label.configure(text=self.anchor.strftime("%B %Y"))
+
+        day_count = (end - start).days + 1
+        for index, cell in enumerate(self.cells):
+            if index >= day_count:
+                cell.grid_remove()
+                continue
+            day = start + timedelta(days=index)
+            cell.bind_day(day, self.mode == 'week' or day.month == self.anchor.month, day == today)
+            cell.grid()
+
+        meals = self.ranges.get(start, end)
+        if meals is not None:
+            self._fill(generation, start, day_count, meals)
+        else:
+            self.ranges.load(
+                start, end,
+                lambda loaded, error: self.dispatcher.post(self._fill, generation, start, day_count, loaded, error)
+            )
+
+        # Warm the neighbouring ranges so paging is instant
+        self.ranges.prefetch([
+            visible_range(shift_anchor(self.anchor, self.mode, step), self.mode) for step in (1, -1)
+        ])
+
+    def _fill(self, generation: int, start: date, day_count: int, meals: Optional[DayMeals],
+              error: Optional[Exception] = None):
+        if generation != self._generation or not self.winfo_exists():
+            return  # Paged away before this range arrived
+        if error is not None:
+            if self.on_error is not None:
+                self.on_error(f"Failed to load meal plan: {str(error)}")
+            return
+        for index in range(day_count):
+            self.cells[index].bind_meals(meals.get((start + timedelta(days=index)).isoformat(), []))
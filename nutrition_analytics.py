@@ -0,0 +1,161 @@
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from storage import Storage
+
+# Nutrients shown on the dashboard, in display order
+DASHBOARD_NUTRIENTS = ['Calories', 'Protein', 'Fat', 'Saturated Fat', 'Carbohydrates', 'Sugar',
+                       'Fiber', 'Sodium']
+
+PERIODS = ('day', 'week', 'month')
+
+
+class NutritionMatrix:
+    """Per-serving nutrient amounts as a dense (recipe x nutrient) NumPy array"""
+
+    def __init__(self, recipe_ids: Sequence[int], nutrients: Sequence[str], units: Sequence[str], values):
+        self.recipe_ids = list(recipe_ids)
+        self.nutrients = list(nutrients)
+        self.units = list(units)
+        self.values = values
+        self.row_of = {recipe_id: row for row, recipe_id in enumerate(self.recipe_ids)}
+        self.column_of = {nutrient: column for column, nutrient in enumerate(self.nutrients)}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, str, float, str]]) -> 'NutritionMatrix':
+        """Build from (recipe_id, nutrient, amount, unit) rows"""
+        import numpy as np
+
+        rows = list(rows)
+        recipe_ids = sorted({row[0] for row in rows})
+        units = {}
+        for _, nutrient, _, unit in rows:
+            units.setdefault(nutrient, unit)
+        nutrients = sorted(units)
+
+        matrix = cls(recipe_ids, nutrients, [units[nutrient] for nutrient in nutrients],
+                     np.zeros((len(recipe_ids), len(nutrients))))
+        if rows:
+            row_index = np.fromiter((matrix.row_of[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+            column_index = np.fromiter((matrix.column_of[row[1]] for row in rows), dtype=np.intp, count=len(rows))
+            amounts = np.fromiter((row[2] or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+            matrix.values[row_index, column_index] = amounts
+        return matrix
+
+
+def plan_totals(matrix: NutritionMatrix, planned_dates: Sequence[str], recipe_ids: Sequence[int],
+                period: str = 'day'):
+    """Total nutrients per period for planned meals, one serving per meal
+
+    Returns (period_starts, totals, meals, unknown): the first day of each
+    period with meals as datetime64[D], a (period x nutrient) array of totals,
+    the number of meals per period, and how many of those meals have no
+    nutrition data (they count as zero).
+    """
+    import numpy as np
+
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period {period!r}")
+    if not len(planned_dates):
+        return (np.array([], dtype='datetime64[D]'), np.zeros((0, len(matrix.nutrients))),
+                np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+
+    days = np.asarray(planned_dates, dtype='datetime64[D]')
+    if period == 'week':
+        # datetime64 day 0 is a Thursday; shift so periods start on Monday
+        keys = days - ((days.astype(np.int64) + 3) % 7)
+    elif period == 'month':
+        keys = days.astype('datetime64[M]').astype('datetime64[D]')
+    else:
+        keys = days
+
+    rows = np.fromiter((matrix.row_of.get(recipe_id, -1) for recipe_id in recipe_ids),
+                       dtype=np.intp, count=len(recipe_ids))
+    known = rows >= 0
+
+    # Gather each meal's nutrients (zeros when unknown), then reduce runs of equal periods
+    order = np.argsort(keys, kind='stable')
+    keys, rows, known = keys[order], rows[order], known[order]
+    meal_values = np.zeros((len(rows), len(matrix.nutrients)))
+    meal_values[known] = matrix.values[rows[known]]
+
+    period_starts, starts, meals = np.unique(keys, return_index=True, return_counts=True)
+    totals = np.add.reduceat(meal_values, starts, axis=0)
+    unknown = np.add.reduceat((~known).astype(np.intp), starts)
+    return period_starts, totals, meals, unknown
+
+
+class NutritionStore:
+    """Per-serving nutrients of every recipe fetched with nutrition, kept in SQLite"""
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+
+    def add_recipe_information(self, recipe: Dict):
+        """Store the nutrients of an /information payload fetched with includeNutrition"""
+        nutrients = recipe.get('nutrition', {}).get('nutrients')
+        if not nutrients:
+            return
+        with self.storage.transaction() as conn:
+            conn.execute("DELETE FROM recipe_nutrients WHERE recipe_id = ?", (recipe['id'],))
+            conn.executemany(
+                "INSERT OR REPLACE INTO recipe_nutrients (recipe_id, nutrient, amount, unit) VALUES (?, ?, ?, ?)",
+                [(recipe['id'], nutrient['name'], nutrient.get('amount'), nutrient.get('unit'))
+                 for nutrient in nutrients if nutrient.get('name')]
+            )
+
+    def has_recipe(self, recipe_id: int) -> bool:
+        return self.storage.query_one(
+            "SELECT 1 FROM recipe_nutrients WHERE recipe_id = ? LIMIT 1", (recipe_id,)
+        ) is not None
+
+    def planned_without_nutrition(self) -> List[int]:
+        """Planned recipes whose nutrients are not stored yet"""
+        rows = self.storage.query('''
+            SELECT DISTINCT recipe_id FROM meal_plans
+            WHERE recipe_id NOT IN (SELECT recipe_id FROM recipe_nutrients)
+        ''')
+        return [row[0] for row in rows]
+
+    def planned_meals(self) -> Tuple[List[str], List[int], int]:
+        """(planned_date, recipe_id) columns for every planned meal, and how many were skipped
+
+        Meals saved before dates were validated may have a date that does
+        not parse; they cannot be placed in a period and are only counted.
+        """
+        planned_dates, recipe_ids = [], []
+        undated = 0
+        for planned_date, recipe_id in self.storage.query(
+                "SELECT planned_date, recipe_id FROM meal_plans ORDER BY planned_date"):
+            try:
+                planned_dates.append(date.fromisoformat(planned_date).isoformat())
+            except (TypeError, ValueError):
+                undated += 1
+                continue
+            recipe_ids.append(recipe_id)
+        return planned_dates, recipe_ids, undated
+
+    def planned_matrix(self) -> NutritionMatrix:
+        """Nutrition matrix covering the recipes in the meal plan"""
+        return NutritionMatrix.from_rows(self.storage.query('''
+            SELECT recipe_id, nutrient, amount, unit FROM recipe_nutrients
+            WHERE recipe_id IN (SELECT DISTINCT recipe_id FROM meal_plans)
+        '''))
+
+    def dashboard(self, period: str) -> Dict:
+        """Everything the dashboard shows for one period size, with timing"""
+        start = time.perf_counter()
+        planned_dates, recipe_ids, undated = self.planned_meals()
+        matrix = self.planned_matrix()
+        period_starts, totals, meals, unknown = plan_totals(matrix, planned_dates, recipe_ids, period)
+        return {
+            'period': period,
+            'matrix': matrix,
+            'period_starts': period_starts,
+            'totals': totals,
+            'meals': meals,
+            'unknown': unknown,
+            'undated': undated,
+            'elapsed_ms': (time.perf_counter() - start) * 1000,
+        }
@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Callable, Dict, Iterable
+
+
+class DetailPrefetcher:
+    """Speculatively fetch recipe details for recipes the user can see
+
+    Fetches run on a few low-priority worker threads, are limited to a daily
+    request budget, and wait while any foreground request is running.
+    """
+
+    def __init__(self, fetch: Callable[[int], Any], is_cached: Callable[[int], bool],
+                 max_concurrency: int = 2, daily_budget: int = 50):
+        self.fetch = fetch
+        self.is_cached = is_cached
+        self.max_concurrency = max_concurrency
+        self.daily_budget = daily_budget
+
+        self._cond = threading.Condition()
+        self._queue: "OrderedDict[int, None]" = OrderedDict()
+        self._foreground = 0
+        self._workers = []
+        self._budget_day = date.today()
+        self.spent = 0
+
+    def enqueue(self, recipe_ids: Iterable[int]):
+        """Replace the pending queue with the recipes now in view"""
+        with self._cond:
+            self._queue = OrderedDict((recipe_id, None) for recipe_id in recipe_ids)
+            self._start_workers()
+            self._cond.notify_all()
+
+    def clear(self):
+        with self._cond:
+            self._queue.clear()
+
+    @contextmanager
+    def foreground(self):
+        """Mark a user-initiated request; prefetching pauses until it finishes"""
+        with self._cond:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._foreground -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                'queued': len(self._queue),
+                'spent': self.spent,
+                'budget': self.daily_budget,
+            }
+
+    def _budget_left(self) -> bool:
+        if self._budget_day != date.today():
+            self._budget_day = date.today()
+            self.spent = 0
+        return self.spent < self.daily_budget
+
+    def _start_workers(self):
+        while len(self._workers) < self.max_concurrency:
+            worker = threading.Thread(target=self._run, daemon=True, name='prefetch')
+            worker.start()
+            self._workers.append(worker)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue or self._foreground or not self._budget_left():
+                    # Re-check once a minute so a new day's budget is picked up
+                    self._cond.wait(timeout=60)
+                recipe_id, _ = self._queue.popitem(last=False)
+
+            if self.is_cached(recipe_id):
+                continue
+
+            with self._cond:
+                self.spent += 1
+            try:
+                self.fetch(recipe_id)
+            except Exception:
+                pass  # Speculative; the user will see any error on a real open
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from storage import Storage
+
+# Time-to-live per endpoint, in seconds
+DEFAULT_TTLS = {
+    'information': 7 * 24 * 3600,  # Recipe details rarely change
+    'findByIngredients': 6 * 3600,
+}
+
+
+class ResponseCache:
+    """Persistent TTL/LRU cache for Spoonacular API responses"""
+
+    def __init__(self, storage: Storage, max_entries: int = 2000,
+                 ttls: Optional[Dict[str, int]] = None, default_ttl: int = 24 * 3600):
+        self.storage = storage
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Guards the counters and size bookkeeping shared by all threads
+        self._lock = threading.Lock()
+        self._size = self.storage.query_one("SELECT COUNT(*) FROM api_cache")[0]
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Build a stable cache key from an endpoint and its params"""
+        # The API key is a credential, not part of the request identity
+        params = {k: v for k, v in (params or {}).items() if k != 'apiKey'}
+        return f"{endpoint}?{json.dumps(params, sort_keys=True, default=str)}"
+
+    def ttl_for(self, endpoint: str) -> int:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Return a cached response, or None if missing or expired"""
+        entry = self._read(endpoint, params, include_stale=False)
+        return entry[0] if entry is not None else None
+
+    def lookup(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Tuple[Any, bool]]:
+        """Return (response, fresh) even for expired entries, or None if not cached
+
+        Expired responses are kept until evicted so they can be served while
+        a fresh copy is fetched, or while the API is unreachable.
+        """
+        return self._read(endpoint, params, include_stale=True)
+
+    def _read(self, endpoint: str, params: Optional[Dict], include_stale: bool) -> Optional[Tuple[Any, bool]]:
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        row = self.storage.query_one(
+            "SELECT response, created_at FROM api_cache WHERE cache_key = ?", (key,)
+        )
+
+        fresh = row is not None and now - row[1] <= self.ttl_for(endpoint)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if row is None or not (fresh or include_stale):
+            return None
+
+        # Recency only feeds eviction, so it can be written lazily in a batch
+        self.storage.submit_write("UPDATE api_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+        return json.loads(row[0]), fresh
+
+    def contains(self, endpoint: str, params: Optional[Dict] = None) -> bool:
+        """Whether a fresh response is cached, without touching counters or LRU order"""
+        row = self.storage.query_one(
+            "SELECT created_at FROM api_cache WHERE cache_key = ?", (self.make_key(endpoint, params),)
+        )
+        return row is not None and time.time() - row[0] <= self.ttl_for(endpoint)
+
+    def set(self, endpoint: str, params: Optional[Dict], value: Any):
+        """Store a response and evict least recently used entries over the limit"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock, self.storage.transaction() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM api_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO api_cache (cache_key, endpoint, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(value), now, now)
+            )
+            if not exists:
+                self._size += 1
+
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM api_cache WHERE cache_key IN "
+                    "(SELECT cache_key FROM api_cache ORDER BY last_access LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+                self._size -= overflow
+
+    def values(self, endpoint: str) -> Iterator[Any]:
+        """Iterate over every cached response for an endpoint, expired or not"""
+        rows = self.storage.iterate("SELECT response FROM api_cache WHERE endpoint = ?", (endpoint,))
+        for row in rows:
+            yield json.loads(row[0])
+
+    def invalidate(self, endpoint: str, params: Optional[Dict] = None):
+        """Remove a single cached response"""
+        with self._lock, self.storage.transaction() as conn:
+            conn.execute("DELETE FROM api_cache WHERE cache_key = ?", (self.make_key(endpoint, params),))
+            self._size = conn.execute("SELECT COUNT(*) FROM api_cache").fetchone()[0]
+
+    def recount(self):
+        """Re-read the entry count after rows were written outside this cache, e.g. by an import"""
+        with self._lock:
+            self._size = self.storage.query_one("SELECT COUNT(*) FROM api_cache")[0]
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self.storage.execute("DELETE FROM api_cache")
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': self._size,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
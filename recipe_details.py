@@ -0,0 +1,186 @@
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import customtkinter as ctk
+
+from recipe_models import Recipe
+from tracing import tracer
+
+HTML_TAG = re.compile('<[^<]+?>')
+
+TABS = ("Overview", "Ingredients", "Instructions", "Nutrition")
+
+
+def _ingredients_text(recipe: Recipe) -> str:
+    return ''.join(f"• {ingredient.original}\n" for ingredient in recipe.ingredients)
+
+
+def _instructions_text(recipe: Recipe) -> str:
+    if recipe.instructions:
+        return HTML_TAG.sub('', recipe.instructions)
+    return "No instructions available."
+
+
+def _nutrition_text(recipe: Recipe) -> str:
+    return ''.join(f"{nutrient.name}: {nutrient.amount}{nutrient.unit}\n" for nutrient in recipe.nutrients)
+
+
+PARSERS = {
+    "Ingredients": _ingredients_text,
+    "Instructions": _instructions_text,
+    "Nutrition": _nutrition_text,
+}
+
+
+class RecipeContentCache:
+    """Parsed, display-ready text per recipe and tab, least recently used first out"""
+
+    def __init__(self, max_recipes: int = 50):
+        self.max_recipes = max_recipes
+        self._entries: "OrderedDict[int, Dict[str, str]]" = OrderedDict()
+
+    def get(self, recipe: Recipe, tab: str) -> str:
+        entry = self._entries.get(recipe.id)
+        if entry is None:
+            entry = self._entries[recipe.id] = {}
+            if len(self._entries) > self.max_recipes:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(recipe.id)
+        if tab not in entry:
+            entry[tab] = PARSERS[tab](recipe)
+        return entry[tab]
+
+    def discard(self, recipe_id: int):
+        """Drop parsed text for a recipe whose details changed"""
+        self._entries.pop(recipe_id, None)
+
+
+class RecipeDetailsWindow(ctk.CTkToplevel):
+    """Recipe details window that is hidden on close and rebound to the next recipe
+
+    Widgets are built once. Each tab is filled the first time it is shown
+    for the current recipe, from text parsed once per recipe.
+    """
+
+    def __init__(self, master, on_meal_plan: Callable[[int], None],
+                 on_shopping_list: Callable[[int], None], content_cache: Optional[RecipeContentCache] = None):
+        super().__init__(master)
+        self.title("Recipe Details")
+        self.geometry("800x900")
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        self.content_cache = content_cache or RecipeContentCache()
+        self.recipe_id = None
+        self.recipe = None
+        self._rendered = set()
+
+        self.status_label = ctk.CTkLabel(self, text="")
+        self.stale_label = ctk.CTkLabel(
+            self,
+            text="📴 Showing a saved copy; it will refresh when Spoonacular is reachable",
+            text_color=("gray40", "gray60")
+        )
+
+        # Create tabview for organized information
+        self.tabview = ctk.CTkTabview(self, command=self._render_current_tab)
+        self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
+        for tab in TABS:
+            self.tabview.add(tab)
+
+        # Overview tab
+        overview_tab = self.tabview.tab("Overview")
+        self.title_label = ctk.CTkLabel(overview_tab, text="", font=ctk.CTkFont(size=24, weight="bold"),
+                                        wraplength=700)
+        self.title_label.pack(pady=10)
+
+        # Quick info
+        info_frame = ctk.CTkFrame(overview_tab)
+        info_frame.pack(fill="x", pady=10)
+        self.time_label = ctk.CTkLabel(info_frame, text="")
+        self.time_label.pack(side="left", padx=10)
+        self.servings_label = ctk.CTkLabel(info_frame, text="")
+        self.servings_label.pack(side="left", padx=10)
+
+        self.textboxes = {}
+        for tab in PARSERS:
+            textbox = ctk.CTkTextbox(self.tabview.tab(tab))
+            textbox.pack(fill="both", expand=True, padx=10, pady=10)
+            self.textboxes[tab] = textbox
+
+        # Action buttons
+        self.action_frame = ctk.CTkFrame(self)
+        self.action_frame.pack(fill="x", padx=20, pady=10)
+
+        ctk.CTkButton(
+            self.action_frame,
+            text="Add to Meal Plan",
+            command=lambda: on_meal_plan(self.recipe_id)
+        ).pack(side="left", padx=5)
+
+        ctk.CTkButton(
+            self.action_frame,
+            text="Generate Shopping List",
+            command=lambda: on_shopping_list(self.recipe_id)
+        ).pack(side="left", padx=5)
+
+    def show_loading(self, recipe_id: int):
+        """Bring the window up for a recipe whose details are on the way"""
+        self.recipe_id = recipe_id
+        self.recipe = None
+        self._rendered.clear()
+        self.stale_label.pack_forget()
+        self._set_status("Loading recipe...")
+        self.deiconify()
+        self.lift()
+
+    def show_error(self, recipe_id: int, message: str):
+        if recipe_id == self.recipe_id:
+            self._set_status(message)
+
+    def bind_recipe(self, recipe: Recipe):
+        """Show a fetched recipe; ignored if another recipe was opened since"""
+        if recipe.id != self.recipe_id:
+            return
+        with tracer.span('ui.details_bind', 'ui'):
+            self.recipe = recipe
+            self._rendered.clear()
+            self._set_status(None)
+            self._render_current_tab()
+
+    def set_stale(self, stale: bool):
+        """Show or hide the notice that the recipe came from an expired cache entry"""
+        if not stale:
+            self.stale_label.pack_forget()
+        elif self.tabview.winfo_manager():
+            self.stale_label.pack(before=self.tabview, pady=(10, 0))
+
+    def _set_status(self, text: Optional[str]):
+        if text is None:
+            self.status_label.pack_forget()
+            self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
+            self.action_frame.pack(fill="x", padx=20, pady=10)
+        else:
+            self.status_label.configure(text=text)
+            self.tabview.pack_forget()
+            self.action_frame.pack_forget()
+            self.status_label.pack(pady=20)
+
+    def _render_current_tab(self):
+        """Fill the selected tab unless it already shows the current recipe"""
+        tab = self.tabview.get()
+        if self.recipe is None or tab in self._rendered:
+            return
+        self._rendered.add(tab)
+        recipe = self.recipe
+
+        if tab == "Overview":
+            self.title_label.configure(text=recipe.title)
+            self.time_label.configure(text=f"⏱️ {recipe.ready_in_minutes or 'N/A'} minutes")
+            self.servings_label.configure(text=f"👥 Serves {recipe.servings or 'N/A'}")
+            return
+
+        textbox = self.textboxes[tab]
+        textbox.delete("1.0", "end")
+        textbox.insert("end", self.content_cache.get(recipe, tab))
@@ -0,0 +1,262 @@
+import math
+from typing import Callable, Dict, List, Optional
+
+import customtkinter as ctk
+
+from recipe_models import Recipe
+from tracing import tracer
+
+
+class RecipeCard(ctk.CTkFrame):
+    """Recipe card widget that can be rebound to a different recipe"""
+
+    def __init__(self, master, image_loader, on_view: Callable[[int], None],
+                 on_favorite: Callable[[Recipe], None]):
+        super().__init__(master)
+        self.image_loader = image_loader
+        self.recipe = None
+
+        # Recipe image
+        self.img_label = ctk.CTkLabel(self, text="", width=200, height=200)
+        self.img_label.pack(padx=10, pady=10)
+
+        # Recipe title
+        self.title_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            wraplength=180
+        )
+        self.title_label.pack(padx=10, pady=5)
+
+        # Quick info
+        self.info_frame = ctk.CTkFrame(self)
+        self.info_frame.pack(fill="x", padx=10, pady=5)
+        self.time_label = ctk.CTkLabel(self.info_frame, text="")
+        self.servings_label = ctk.CTkLabel(self.info_frame, text="")
+
+        # Action buttons
+        btn_frame = ctk.CTkFrame(self)
+        btn_frame.pack(fill="x", padx=10, pady=10)
+
+        ctk.CTkButton(
+            btn_frame,
+            text="View Recipe",
+            width=90,
+            height=30,
+            command=lambda: on_view(self.recipe.id)
+        ).pack(side="left", padx=5)
+
+        ctk.CTkButton(
+            btn_frame,
+            text="♥",
+            width=30,
+            height=30,
+            command=lambda: on_favorite(self.recipe)
+        ).pack(side="left", padx=5)
+
+    def bind_recipe(self, recipe: Recipe):
+        """Show a recipe in this card"""
+        with tracer.span('ui.card_bind', 'ui'):
+            self.recipe = recipe
+            self.title_label.configure(text=recipe.title)
+
+            self.time_label.pack_forget()
+            self.servings_label.pack_forget()
+            if recipe.ready_in_minutes:
+                self.time_label.configure(text=f"⏱️ {recipe.ready_in_minutes} min")
+                self.time_label.pack(side="left", padx=5)
+            if recipe.servings:
+                self.servings_label.configure(text=f"👥 Serves {recipe.servings}")
+                self.servings_label.pack(side="left", padx=5)
+
+            # Placeholder until the background download finishes
+            self.img_label.configure(text="Loading..." if recipe.image else "[No Image]")
+            self._clear_image()
+            if recipe.image:
+                self.image_loader.load(recipe.image, lambda photo: self._attach_image(recipe, photo))
+
+    def release(self):
+        """Let go of the recipe and its image while the card waits in the pool
+
+        The image loader keeps recently shown images, so rebinding is cheap.
+        """
+        self.recipe = None
+        self._clear_image()
+
+    def _clear_image(self):
+        if self.img_label.cget("image"):
+            self.img_label.configure(image="")
+        self.img_label.image = None
+
+    def _attach_image(self, recipe: Recipe, photo):
+        # Ignore images that arrive after the card was rebound
+        if self.recipe is not recipe or not self.winfo_exists():
+            return
+        if photo is None:
+            # Fallback if image loading fails
+            self.img_label.configure(text="[No Image]")
+            return
+        self.img_label.configure(image=photo, text="")
+        self.img_label.image = photo  # Keep a reference
+
+
+class RecipeGrid:
+    """Virtualized, paginated grid of recycled recipe cards
+
+    Only the rows in view (plus an overscan margin) have card widgets. Cards
+    scrolled out of view go back to a pool and are rebound to other recipes,
+    and the next page is requested when the view nears the last loaded row.
+    """
+
+    def __init__(self, scroll_frame: ctk.CTkScrollableFrame, card_factory: Callable[[], RecipeCard],
+                 dispatcher, columns: int = 3, row_height: int = 380, overscan_rows: int = 1,
+                 prefetch_rows: int = 2):
+        self.scroll_frame = scroll_frame
+        self.card_factory = card_factory
+        self.dispatcher = dispatcher
+        self.columns = columns
+        self.row_height = row_height
+        self.overscan_rows = overscan_rows
+        self.prefetch_rows = prefetch_rows
+
+        self.items: List[Recipe] = []
+        self.has_more = False
+        self.loading = False
+        self._load_more = None
+        self._on_visible = None
+        self._generation = 0
+
+        self._active: Dict[int, RecipeCard] = {}  # Item index -> card
+        self._visible = range(0)
+        self._pool: List[RecipeCard] = []
+        self._configured_rows = 0
+        self._message = None
+        self._refresh_pending = False
+
+        # Watch the scroll position through the canvas scroll command
+        self._canvas = scroll_frame._parent_canvas
+        self._scrollbar_set = scroll_frame._scrollbar.set
+        self._canvas.configure(yscrollcommand=self._on_yscroll)
+        self._canvas.bind("<Configure>", lambda event: self.schedule_refresh(), add="+")
+
+    def set_items(self, items: List[Recipe], has_more: bool = False,
+                  load_more: Optional[Callable[[int, Callable[[List[Recipe], bool], None]], None]] = None,
+                  on_visible: Optional[Callable[[List[Recipe]], None]] = None):
+        """Replace the grid contents
+
+        load_more(offset, done) is called on the Tk thread when more rows are
+        needed; done(items, has_more) may be called from any thread.
+        on_visible(items) is called whenever the set of visible recipes changes.
+        """
+        self.clear()
+        self.items = list(items)
+        self.has_more = has_more
+        self._load_more = load_more
+        self._on_visible = on_visible
+        self._update_rows()
+        self._canvas.yview_moveto(0)
+        self.schedule_refresh()
+
+    def clear(self):
+        """Remove all recipes, returning every card to the pool"""
+        self._generation += 1
+        for index in list(self._active):
+            self._release(index)
+        if self._message is not None:
+            self._message.destroy()
+            self._message = None
+        self.items = []
+        self.has_more = False
+        self.loading = False
+        self._load_more = None
+        self._on_visible = None
+        # Forget the old range so the next search's first page reports its visible recipes
+        self._visible = range(0)
+        self._update_rows()
+
+    def show_message(self, text: str):
+        """Replace the grid contents with a message"""
+        self.clear()
+        self._message = ctk.CTkLabel(self.scroll_frame, text=text, font=ctk.CTkFont(size=16))
+        self._message.grid(row=0, column=0, columnspan=self.columns, pady=20)
+
+    def owns(self, widget) -> bool:
+        """Whether a widget is one of the grid's cards or messages"""
+        return widget is self._message or widget in self._pool or widget in self._active.values()
+
+    def schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.scroll_frame.after_idle(self._refresh)
+
+    def _on_yscroll(self, first, last):
+        self._scrollbar_set(first, last)
+        self.schedule_refresh()
+
+    def _update_rows(self):
+        """Reserve space for every row so the scrollbar reflects the full list"""
+        total_rows = math.ceil(len(self.items) / self.columns)
+        row_height = int(self.row_height * self.scroll_frame._get_widget_scaling())
+        for row in range(total_rows):
+            self.scroll_frame.grid_rowconfigure(row, minsize=row_height)
+        for row in range(total_rows, self._configured_rows):
+            self.scroll_frame.grid_rowconfigure(row, minsize=0)
+        self._configured_rows = total_rows
+
+    def _release(self, index: int):
+        card = self._active.pop(index)
+        card.grid_remove()
+        card.release()
+        self._pool.append(card)
+
+    def _refresh(self):
+        """Materialize cards for the visible rows and recycle the rest"""
+        self._refresh_pending = False
+        total_rows = math.ceil(len(self.items) / self.columns)
+        if total_rows == 0:
+            return
+
+        top, bottom = self._canvas.yview()
+        first_row = max(0, int(top * total_rows) - self.overscan_rows)
+        last_row = min(total_rows - 1, math.ceil(bottom * total_rows) + self.overscan_rows)
+        visible = range(first_row * self.columns, min(len(self.items), (last_row + 1) * self.columns))
+        if visible != self._visible and self._on_visible is not None:
+            self._on_visible([self.items[index] for index in visible])
+        self._visible = visible
+
+        for index in [i for i in self._active if i not in visible]:
+            self._release(index)
+
+        # Cards are built through the dispatcher so a large jump is spread over several frames
+        for index in visible:
+            if index not in self._active:
+                self.dispatcher.post(self._materialize, self._generation, index)
+
+        # Request the next page before the user reaches the end
+        if (self.has_more and not self.loading and self._load_more is not None
+                and last_row >= total_rows - 1 - self.prefetch_rows):
+            self.loading = True
+            generation = self._generation
+            self._load_more(
+                len(self.items),
+                lambda items, has_more: self.dispatcher.post(self._on_page, generation, items, has_more)
+            )
+
+    def _materialize(self, generation: int, index: int):
+        if generation != self._generation or index not in self._visible or index in self._active:
+            return  # Scrolled away or replaced before this card's turn came
+        card = self._pool.pop() if self._pool else self.card_factory()
+        card.bind_recipe(self.items[index])
+        card.grid(row=index // self.columns, column=index % self.columns,
+                  padx=10, pady=10, sticky="nsew")
+        self._active[index] = card
+
+    def _on_page(self, generation: int, items: List[Recipe], has_more: bool):
+        if generation != self._generation:
+            return  # Results for contents that have since been replaced
+        self.loading = False
+        self.items.extend(items)
+        self.has_more = has_more and bool(items)
+        self._update_rows()
+        self.schedule_refresh()
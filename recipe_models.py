@@ -0,0 +1,121 @@
+import sys
+from typing import Callable, Dict, Optional, Tuple
+
+# recipe_id -> stored /information payload, or None if it has not been fetched
+DetailLoader = Callable[[int], Optional[Dict]]
+
+
+def _intern(text: Optional[str]) -> str:
+    # Ingredient, aisle, unit and nutrient names repeat across thousands of recipes
+    return sys.intern(text) if text else ''
+
+
+class Ingredient:
+    """One ingredient line of a recipe"""
+
+    __slots__ = ('id', 'name', 'amount', 'unit', 'aisle', 'original')
+
+    def __init__(self, id: Optional[int], name: str, amount: float, unit: str, aisle: str, original: str):
+        self.id = id
+        self.name = _intern(name)
+        self.amount = amount
+        self.unit = _intern(unit)
+        self.aisle = _intern(aisle)
+        self.original = original
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'Ingredient':
+        """Build from an extendedIngredients entry"""
+        return cls(data.get('id'), data.get('name') or '', data.get('amount') or 0, data.get('unit'),
+                   data.get('aisle'), data.get('original') or data.get('name') or '')
+
+
+class Nutrient:
+    """Per-serving amount of one nutrient"""
+
+    __slots__ = ('name', 'amount', 'unit')
+
+    def __init__(self, name: str, amount: float, unit: str):
+        self.name = _intern(name)
+        self.amount = amount
+        self.unit = _intern(unit)
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'Nutrient':
+        return cls(data.get('name'), data.get('amount') or 0, data.get('unit'))
+
+
+class Recipe:
+    """Recipe summary as shown on cards and in lists
+
+    Ingredients, instructions and nutrients are only kept once they are
+    needed: they are read through the loader (the stored /information
+    payload) on first access, or filled in directly by from_information.
+    """
+
+    __slots__ = ('id', 'title', 'image', 'ready_in_minutes', 'servings',
+                 '_ingredients', '_instructions', '_nutrients', '_loader')
+
+    def __init__(self, id: int, title: str, image: Optional[str] = None, ready_in_minutes: Optional[int] = None,
+                 servings: Optional[int] = None, loader: Optional[DetailLoader] = None):
+        self.id = id
+        self.title = title
+        self.image = image or None
+        self.ready_in_minutes = ready_in_minutes
+        self.servings = servings
+        self._ingredients: Optional[Tuple[Ingredient, ...]] = None
+        self._instructions: Optional[str] = None
+        self._nutrients: Optional[Tuple[Nutrient, ...]] = None
+        self._loader = loader
+
+    @classmethod
+    def from_json(cls, data: Dict, loader: Optional[DetailLoader] = None) -> 'Recipe':
+        """Summary of a search result or /information payload; details stay in the store"""
+        return cls(data['id'], data.get('title') or f"Recipe {data['id']}", data.get('image'),
+                   data.get('readyInMinutes'), data.get('servings'), loader)
+
+    @classmethod
+    def from_information(cls, data: Dict) -> 'Recipe':
+        """Recipe with its details filled in from an /information payload"""
+        recipe = cls.from_json(data)
+        recipe._set_details(data)
+        return recipe
+
+    @property
+    def ingredients(self) -> Tuple[Ingredient, ...]:
+        if self._ingredients is None:
+            self._load_details()
+        return self._ingredients or ()
+
+    @property
+    def instructions(self) -> str:
+        if self._instructions is None:
+            self._load_details()
+        return self._instructions or ''
+
+    @property
+    def nutrients(self) -> Tuple[Nutrient, ...]:
+        if self._nutrients is None:
+            self._load_details()
+        return self._nutrients or ()
+
+    @property
+    def details_loaded(self) -> bool:
+        return self._ingredients is not None
+
+    def _load_details(self):
+        data = self._loader(self.id) if self._loader is not None else None
+        if data is not None:
+            # Keep nothing but the parsed fields; the payload itself is dropped
+            self._set_details(data)
+            self._loader = None
+
+    def _set_details(self, data: Dict):
+        self._ingredients = tuple(Ingredient.from_json(ingredient)
+                                  for ingredient in data.get('extendedIngredients') or ())
+        self._instructions = data.get('instructions') or ''
+        self._nutrients = tuple(Nutrient.from_json(nutrient)
+                                for nutrient in (data.get('nutrition') or {}).get('nutrients') or ())
+
+    def __repr__(self) -> str:
+        return f"Recipe(id={self.id!r}, title={self.title!r})"
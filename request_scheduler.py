@@ -0,0 +1,217 @@
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from spoonacular_client import SpoonacularError
+
+# Priority classes, most urgent first
+INTERACTIVE = 0  # The user is waiting on the result: searches, opening a recipe
+BATCH = 1  # User-initiated bulk work: combined shopping list, nutrition dashboard
+SPECULATIVE = 2  # Nobody is waiting: prefetching, background revalidation
+PRIORITY_NAMES = ('interactive', 'batch', 'speculative')
+
+
+def _quota_day():
+    # Spoonacular resets quotas at midnight UTC
+    return datetime.now(timezone.utc).date()
+
+
+class QuotaExhausted(SpoonacularError):
+    """Raised instead of sending a request whose class may not spend the points left"""
+
+    def __init__(self, message: str):
+        super().__init__(message, status_code=402)
+
+
+class _Ticket:
+    __slots__ = ('priority', 'flow', 'cost', 'granted', 'error', 'settled')
+
+    def __init__(self, priority: int, flow: str, cost: float):
+        self.priority = priority
+        self.flow = flow
+        self.cost = cost
+        self.granted = False
+        self.error: Optional[Exception] = None
+        self.settled = False  # Its points have moved from in flight to spent
+
+
+class RequestScheduler:
+    """Order API requests by priority class within Spoonacular's daily point quota
+
+    Callers mark their thread's requests with priority(). Waiting requests
+    are served strictly by class; within a class, flows (a search, a
+    shopping list, the prefetcher) take turns so one large job cannot
+    starve another. interactive_slots connections are held back for
+    interactive requests so they never queue behind batch work.
+
+    Points come out of a daily token bucket that is resynchronised from
+    the X-API-Quota-* response headers. Each class must leave a share of
+    the daily quota (reserves) untouched for the classes above it; a
+    request that would dig into that share fails with QuotaExhausted
+    instead of being sent.
+    """
+
+    def __init__(self, daily_quota: float = 150, max_concurrency: int = 8, interactive_slots: int = 2,
+                 reserves: Tuple[float, float, float] = (0.0, 0.1, 0.5)):
+        self.daily_quota = daily_quota
+        self.max_concurrency = max_concurrency
+        self.interactive_slots = interactive_slots
+        self.reserves = reserves
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        # One queue per class: flow -> waiting tickets, rotated for round-robin service
+        self._queues = [OrderedDict() for _ in PRIORITY_NAMES]
+        self._in_flight = [0] * len(PRIORITY_NAMES)
+        self._in_flight_points = 0.0
+        self._day = _quota_day()
+        self.spent = 0.0
+        self.spent_by_class = [0.0] * len(PRIORITY_NAMES)
+        self.requests_by_class = [0] * len(PRIORITY_NAMES)
+        self.rejected_by_class = [0] * len(PRIORITY_NAMES)
+
+    @contextmanager
+    def priority(self, priority: int, flow: Optional[str] = None):
+        """Send this thread's requests with the given class, as part of flow"""
+        previous = getattr(self._local, 'context', None)
+        self._local.context = (priority, flow or PRIORITY_NAMES[priority])
+        try:
+            yield
+        finally:
+            self._local.context = previous
+
+    def current(self) -> Tuple[int, str]:
+        """This thread's (priority, flow); unmarked requests count as interactive"""
+        return getattr(self._local, 'context', None) or (INTERACTIVE, PRIORITY_NAMES[INTERACTIVE])
+
+    def bind(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap fn so it runs with the caller's priority on another thread"""
+        priority, flow = self.current()
+
+        def run(*args, **kwargs):
+            with self.priority(priority, flow):
+                return fn(*args, **kwargs)
+
+        return run
+
+    @contextmanager
+    def slot(self, cost: float):
+        """Wait for this thread's turn to send a request costing about cost points"""
+        priority, flow = self.current()
+        ticket = _Ticket(priority, flow, cost)
+        with self._cond:
+            self._queues[priority].setdefault(flow, deque()).append(ticket)
+            self._dispatch()
+            while not (ticket.granted or ticket.error):
+                self._cond.wait()
+            if ticket.error is not None:
+                raise ticket.error
+        try:
+            yield ticket
+        finally:
+            with self._cond:
+                self._in_flight[priority] -= 1
+                if not ticket.settled:
+                    self._in_flight_points -= cost
+                self._dispatch()
+
+    def record(self, ticket: _Ticket, headers: Mapping[str, str]):
+        """Account for a completed request from its quota response headers"""
+        cost = _header_float(headers, 'X-API-Quota-Request')
+        used = _header_float(headers, 'X-API-Quota-Used')
+        left = _header_float(headers, 'X-API-Quota-Left')
+        if cost is None:
+            cost = ticket.cost
+        with self._cond:
+            self._roll_day()
+            # Counted as spent from here on; leaving it in flight too would count it twice
+            if not ticket.settled:
+                ticket.settled = True
+                self._in_flight_points -= ticket.cost
+            self.spent_by_class[ticket.priority] += cost
+            self.requests_by_class[ticket.priority] += 1
+            if used is not None:
+                self.spent = used
+                if left is not None:
+                    self.daily_quota = used + left
+            else:
+                self.spent += cost
+            self._dispatch()
+
+    def mark_exhausted(self):
+        """The API refused a request for lack of points; spend nothing more today"""
+        with self._cond:
+            self.spent = max(self.spent, self.daily_quota)
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._roll_day()
+            return {
+                'spent': round(self.spent, 2),
+                'daily_quota': round(self.daily_quota, 2),
+                'remaining': round(max(0.0, self.daily_quota - self.spent), 2),
+                'in_flight': sum(self._in_flight),
+                'classes': {
+                    name: {
+                        'queued': sum(len(tickets) for tickets in self._queues[priority].values()),
+                        'in_flight': self._in_flight[priority],
+                        'spent': round(self.spent_by_class[priority], 2),
+                        'requests': self.requests_by_class[priority],
+                        'rejected': self.rejected_by_class[priority],
+                    }
+                    for priority, name in enumerate(PRIORITY_NAMES)
+                },
+            }
+
+    def _roll_day(self):
+        today = _quota_day()
+        if today != self._day:
+            self._day = today
+            self.spent = 0.0
+            self.spent_by_class = [0.0] * len(PRIORITY_NAMES)
+            self.requests_by_class = [0] * len(PRIORITY_NAMES)
+            self.rejected_by_class = [0] * len(PRIORITY_NAMES)
+
+    def _dispatch(self):
+        """Grant waiting tickets while connections are free; call with the lock held"""
+        self._roll_day()
+        granted = False
+        for priority, queue in enumerate(self._queues):
+            limit = self.max_concurrency - (self.interactive_slots if priority != INTERACTIVE else 0)
+            while queue:
+                flow, tickets = next(iter(queue.items()))
+                ticket = tickets[0]
+                floor = self.daily_quota * self.reserves[priority]
+                if self.daily_quota - self.spent - self._in_flight_points - ticket.cost < floor:
+                    # Rejected at once rather than left waiting for tomorrow
+                    ticket.error = QuotaExhausted(
+                        f"Daily Spoonacular quota is reserved for more urgent requests "
+                        f"({self.daily_quota - self.spent:.1f} of {self.daily_quota:.0f} points left)"
+                    )
+                    self.rejected_by_class[priority] += 1
+                elif sum(self._in_flight) >= limit:
+                    break
+                else:
+                    ticket.granted = True
+                    self._in_flight[priority] += 1
+                    self._in_flight_points += ticket.cost
+                tickets.popleft()
+                # Round robin: the flow goes to the back of its class
+                del queue[flow]
+                if tickets:
+                    queue[flow] = tickets
+                granted = True
+            if queue:
+                break  # Lower classes wait until this one has been served
+        if granted:
+            self._cond.notify_all()
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from spoonacular_client import SpoonacularError
+
+
+def is_outage(error: Exception) -> bool:
+    """Whether an error means the API is unreachable rather than the request being bad"""
+    if isinstance(error, SpoonacularError):
+        return error.status_code is None or error.status_code >= 500
+    return isinstance(error, OSError)
+
+
+class Revalidator:
+    """Refresh stale cached responses in the background
+
+    Refreshes are deduplicated by key. A refresh that fails because the API
+    is unreachable marks the API offline and is retried every
+    retry_interval seconds; the first success, background or foreground,
+    marks it online again and retries everything still pending.
+    """
+
+    def __init__(self, max_workers: int = 2, retry_interval: float = 30):
+        self.retry_interval = retry_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='revalidate')
+
+        self._lock = threading.Lock()
+        self._running = set()
+        self._pending: Dict[Hashable, Tuple[Callable[[], Any], Optional[Callable[[Any], None]]]] = {}
+        self._retry_timer = None
+        self.offline = False
+        self.refreshed = 0
+
+    def submit(self, key: Hashable, fn: Callable[[], Any], on_done: Optional[Callable[[Any], None]] = None):
+        """Run fn() in the background unless a refresh for key is already running
+
+        on_done(result) runs on the worker thread after a successful refresh.
+        """
+        with self._lock:
+            if key in self._running:
+                return
+            self._running.add(key)
+            self._pending.pop(key, None)
+        self.executor.submit(self._run, key, fn, on_done)
+
+    def report_success(self):
+        """Record that an API call succeeded; retries pending refreshes if we were offline"""
+        with self._lock:
+            was_offline = self.offline
+            self.offline = False
+        if was_offline:
+            self._retry_pending()
+
+    def report_failure(self, error: Exception):
+        if not is_outage(error):
+            return
+        with self._lock:
+            self.offline = True
+            if self._retry_timer is None:
+                self._retry_timer = threading.Timer(self.retry_interval, self._retry_pending)
+                self._retry_timer.daemon = True
+                self._retry_timer.start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'offline': self.offline,
+                'pending': len(self._pending),
+                'running': len(self._running),
+                'refreshed': self.refreshed,
+            }
+
+    def _run(self, key: Hashable, fn: Callable[[], Any], on_done):
+        try:
+            result = fn()
+        except Exception as e:
+            with self._lock:
+                self._running.discard(key)
+                if is_outage(e):
+                    self._pending[key] = (fn, on_done)
+            self.report_failure(e)
+            return
+
+        with self._lock:
+            self._running.discard(key)
+            self.refreshed += 1
+        self.report_success()
+        if on_done is not None:
+            try:
+                on_done(result)
+            except Exception:
+                pass
+
+    def _retry_pending(self):
+        with self._lock:
+            self._retry_timer = None
+            pending = list(self._pending.items())
+        for key, (fn, on_done) in pending:
+            self.submit(key, fn, on_done)
+
+    def shutdown(self):
+        with self._lock:
+            if self._retry_timer is not None:
+                self._retry_timer.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
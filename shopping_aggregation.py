@@ -0,0 +1,109 @@
+from typing import Dict, Iterable, List, Tuple
+
+# Canonical units: grams for mass, millilitres for volume
+MASS = 'g'
+VOLUME = 'ml'
+
+# Unit spelling -> (canonical unit, factor to canonical)
+UNIT_CONVERSIONS = {
+    'g': (MASS, 1.0), 'gram': (MASS, 1.0), 'grams': (MASS, 1.0),
+    'kg': (MASS, 1000.0), 'kilogram': (MASS, 1000.0), 'kilograms': (MASS, 1000.0),
+    'mg': (MASS, 0.001), 'milligram': (MASS, 0.001), 'milligrams': (MASS, 0.001),
+    'oz': (MASS, 28.3495), 'ounce': (MASS, 28.3495), 'ounces': (MASS, 28.3495),
+    'lb': (MASS, 453.592), 'lbs': (MASS, 453.592), 'pound': (MASS, 453.592), 'pounds': (MASS, 453.592),
+    'ml': (VOLUME, 1.0), 'milliliter': (VOLUME, 1.0), 'milliliters': (VOLUME, 1.0),
+    'millilitre': (VOLUME, 1.0), 'millilitres': (VOLUME, 1.0),
+    'l': (VOLUME, 1000.0), 'liter': (VOLUME, 1000.0), 'liters': (VOLUME, 1000.0),
+    'litre': (VOLUME, 1000.0), 'litres': (VOLUME, 1000.0),
+    'tsp': (VOLUME, 4.92892), 'tsps': (VOLUME, 4.92892), 'teaspoon': (VOLUME, 4.92892),
+    'teaspoons': (VOLUME, 4.92892), 't': (VOLUME, 4.92892),
+    'tbsp': (VOLUME, 14.7868), 'tbsps': (VOLUME, 14.7868), 'tbs': (VOLUME, 14.7868),
+    'tablespoon': (VOLUME, 14.7868), 'tablespoons': (VOLUME, 14.7868), 'T': (VOLUME, 14.7868),
+    'cup': (VOLUME, 236.588), 'cups': (VOLUME, 236.588), 'c': (VOLUME, 236.588),
+    'fl oz': (VOLUME, 29.5735), 'fl. oz': (VOLUME, 29.5735), 'fluid ounce': (VOLUME, 29.5735),
+    'fluid ounces': (VOLUME, 29.5735),
+    'pint': (VOLUME, 473.176), 'pints': (VOLUME, 473.176),
+    'quart': (VOLUME, 946.353), 'quarts': (VOLUME, 946.353), 'qt': (VOLUME, 946.353),
+    'gallon': (VOLUME, 3785.41), 'gallons': (VOLUME, 3785.41),
+}
+
+# Normalised unit lookups are memoised; recipes reuse a small set of spellings
+_unit_memo: Dict[str, Tuple[str, float]] = {}
+
+
+def canonical_unit(unit: str) -> Tuple[str, float]:
+    """Map a unit spelling to its canonical unit and conversion factor"""
+    try:
+        return _unit_memo[unit]
+    except KeyError:
+        pass
+
+    cleaned = (unit or '').strip().rstrip('.')
+    # A capital "T" is the tablespoon abbreviation, so try the exact spelling first
+    result = UNIT_CONVERSIONS.get(cleaned) or UNIT_CONVERSIONS.get(cleaned.lower())
+    if result is None:
+        # Count units ("clove", "cans", "") only merge with the same unit
+        lowered = cleaned.lower()
+        if len(lowered) > 3 and lowered.endswith('s') and not lowered.endswith('ss'):
+            lowered = lowered[:-1]
+        result = (lowered, 1.0)
+
+    _unit_memo[unit] = result
+    return result
+
+
+def aggregate_ingredients(ingredient_lists: Iterable[List[Dict]]) -> List[Dict]:
+    """Total Spoonacular extendedIngredients across recipes in one pass
+
+    Lines are grouped by ingredient id (or name when there is no id), aisle and
+    canonical unit. Each result has key, name, aisle, amount, unit and count keys
+    and the list is sorted by aisle, then name.
+    """
+    totals: Dict[Tuple, List] = {}
+    memo = _unit_memo
+
+    for ingredients in ingredient_lists:
+        for ingredient in ingredients:
+            unit = ingredient.get('unit') or ''
+            conversion = memo.get(unit) or canonical_unit(unit)
+            ingredient_id = ingredient.get('id')
+            name = ingredient.get('nameClean') or ingredient.get('name') or ingredient.get('original', '')
+            aisle = ingredient.get('aisle') or 'Other'
+            key = (ingredient_id if ingredient_id and ingredient_id > 0 else name, aisle, conversion[0])
+
+            entry = totals.get(key)
+            if entry is None:
+                totals[key] = [name, aisle, conversion[0], (ingredient.get('amount') or 0) * conversion[1], 1]
+            else:
+                entry[3] += (ingredient.get('amount') or 0) * conversion[1]
+                entry[4] += 1
+
+    items = [
+        {'key': item_key(key), 'name': name, 'aisle': aisle, 'unit': unit, 'amount': amount, 'count': count}
+        for key, (name, aisle, unit, amount, count) in totals.items()
+    ]
+    items.sort(key=lambda item: (item['aisle'], item['name']))
+    return items
+
+
+def item_key(key: Tuple) -> str:
+    """Stable text form of a grouping key, for storing aggregated items"""
+    return '|'.join(str(part) for part in key)
+
+
+def format_quantity(amount: float, unit: str) -> str:
+    """Format a canonical amount using a kitchen-friendly unit"""
+    if unit == MASS:
+        if amount >= 1000:
+            return f"{amount / 1000:.2f} kg"
+        return f"{amount:.0f} g"
+    if unit == VOLUME:
+        if amount >= 1000:
+            return f"{amount / 1000:.2f} l"
+        if amount >= 59:  # A quarter cup or more reads best in cups
+            return f"{amount / 236.588:.2f} cups"
+        if amount >= 14.7868:
+            return f"{amount / 14.7868:.1f} tbsp"
+        return f"{amount / 4.92892:.1f} tsp"
+    amount_text = f"{amount:g}" if amount == int(amount) else f"{amount:.2f}"
+    return f"{amount_text} {unit}".strip()
@@ -0,0 +1,103 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from shopping_aggregation import aggregate_ingredients
+from storage import Storage
+
+
+class ShoppingList:
+    """Combined shopping list for the whole meal plan, materialized in SQLite
+
+    Each recipe's ingredients are stored once, totalled per item, in
+    recipe_shopping_lines. Triggers on meal_plans and recipe_shopping_lines
+    add or subtract those contributions in shopping_list_items whenever a
+    meal is planned, changed or removed, or a recipe's ingredients become
+    known, so reading the list never touches the meal plan. Checked-off
+    state stays with an item until no planned meal needs it.
+    """
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+
+    def add_recipe_information(self, recipe: Dict):
+        """Store a recipe's ingredient totals from an /information payload"""
+        items = aggregate_ingredients([recipe.get('extendedIngredients') or []])
+        rows = sorted((item['key'], item['name'], item['aisle'], item['unit'], item['amount'], item['count'])
+                      for item in items)
+        with self.storage.transaction() as conn:
+            existing = conn.execute(
+                "SELECT item, name, aisle, unit, amount, lines FROM recipe_shopping_lines "
+                "WHERE recipe_id = ? ORDER BY item",
+                (recipe['id'],)
+            ).fetchall()
+            if existing == rows:
+                return  # Unchanged; rewriting would churn every planned meal's totals
+            # Items only this recipe needs leave the list while its lines are replaced;
+            # restore their checked state if they come back
+            checked = conn.execute(
+                "SELECT item FROM shopping_list_items WHERE checked AND item IN "
+                "(SELECT item FROM recipe_shopping_lines WHERE recipe_id = ?)",
+                (recipe['id'],)
+            ).fetchall()
+            conn.execute("DELETE FROM recipe_shopping_lines WHERE recipe_id = ?", (recipe['id'],))
+            conn.executemany(
+                '''INSERT INTO recipe_shopping_lines (recipe_id, item, name, aisle, unit, amount, lines)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                [(recipe['id'],) + row for row in rows]
+            )
+            conn.executemany("UPDATE shopping_list_items SET checked = 1 WHERE item = ?", checked)
+
+    def has_recipe(self, recipe_id: int) -> bool:
+        return self.storage.query_one(
+            "SELECT 1 FROM recipe_shopping_lines WHERE recipe_id = ? LIMIT 1", (recipe_id,)
+        ) is not None
+
+    def planned_without_lines(self) -> List[int]:
+        """Planned recipes whose ingredients are not stored yet"""
+        rows = self.storage.query('''
+            SELECT DISTINCT recipe_id FROM meal_plans
+            WHERE recipe_id NOT IN (SELECT recipe_id FROM recipe_shopping_lines)
+        ''')
+        return [row[0] for row in rows]
+
+    def items(self) -> List[Tuple[str, str, str, str, float, int, int, bool]]:
+        """(item, name, aisle, unit, amount, lines, meals, checked) rows by aisle, then name"""
+        return [row[:7] + (bool(row[7]),) for row in self.storage.query('''
+            SELECT item, name, aisle, unit, amount, lines, meals, checked
+            FROM shopping_list_items ORDER BY aisle, name
+        ''')]
+
+    def meals(self) -> List[Tuple[int, str, str, str, str, float, str]]:
+        """(meal_id, planned_date, meal_type, title, name, amount, unit) rows for every planned meal"""
+        return self.storage.query('''
+            SELECT mp.id, mp.planned_date, mp.meal_type, COALESCE(r.title, f.title, 'Recipe ' || mp.recipe_id),
+                   l.name, l.amount, l.unit
+            FROM meal_plans mp
+            JOIN recipe_shopping_lines l ON l.recipe_id = mp.recipe_id
+            LEFT JOIN indexed_recipes r ON r.recipe_id = mp.recipe_id
+            LEFT JOIN favorites f ON f.recipe_id = mp.recipe_id
+            ORDER BY mp.planned_date, mp.meal_type, mp.id, l.aisle, l.name
+        ''')
+
+    def set_checked(self, item: str, checked: bool,
+                    callback: Optional[Callable[[Optional[Exception]], None]] = None):
+        """Check an item off (or back on) without waiting for the write"""
+        self.storage.submit_write(
+            "UPDATE shopping_list_items SET checked = ? WHERE item = ?", (int(checked), item), callback=callback
+        )
+
+    def rebuild(self):
+        """Recompute the list from the meal plan, keeping checked-off state
+
+        Only needed to repair the table; the triggers keep it current.
+        """
+        with self.storage.transaction() as conn:
+            checked = conn.execute("SELECT item FROM shopping_list_items WHERE checked").fetchall()
+            conn.execute("DELETE FROM shopping_list_items")
+            conn.execute('''
+                INSERT INTO shopping_list_items (item, name, aisle, unit, amount, lines, meals)
+                SELECT l.item, MIN(l.name), MIN(l.aisle), MIN(l.unit), SUM(l.amount), SUM(l.lines), COUNT(*)
+                FROM meal_plans mp
+                JOIN recipe_shopping_lines l ON l.recipe_id = mp.recipe_id
+                GROUP BY l.item
+            ''')
+            conn.executemany("UPDATE shopping_list_items SET checked = 1 WHERE item = ?", checked)
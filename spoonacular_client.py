@@ -0,0 +1,182 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from tracing import tracer
+
+DEFAULT_BASE_URL = "https://api.spoonacular.com/recipes"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def estimate_points(path: str, params: Optional[Dict] = None) -> float:
+    """Spoonacular's published point cost of a request, used until the response says otherwise"""
+    params = params or {}
+    if path == 'findByIngredients':
+        return 1 + 0.01 * int(params.get('number', 10))
+    if path == 'informationBulk':
+        count = len(str(params.get('ids', '')).split(','))
+        return 1 + 0.5 * (count - 1)
+    return 1.0
+
+
+class SpoonacularError(Exception):
+    """Raised when a Spoonacular request fails after all retries"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SpoonacularClient:
+    """Spoonacular API client with a pooled session, timeouts and retries
+
+    With a scheduler (request_scheduler.RequestScheduler), API calls wait
+    for their turn and are charged against the daily point quota. Image
+    downloads cost no points and bypass it.
+    """
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL,
+                 timeout: Union[float, Tuple[float, float]] = (3.05, 10),
+                 max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 8,
+                 pool_size: int = 16, scheduler=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.scheduler = scheduler
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Keep-alive connections shared by every caller and worker thread
+
+        requests is imported on first use to keep application startup fast.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def _backoff_delay(self, attempt: int, response=None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when given"""
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            return min(float(response.headers['Retry-After']), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def request(self, url: str, params: Optional[Dict] = None, timeout=None):
+        """GET a URL, retrying connection errors, 429 and 5xx responses"""
+        with tracer.span('api.request', 'network', url=url):
+            return self._request(url, params, timeout)
+
+    def _request(self, url: str, params: Optional[Dict], timeout):
+        import requests
+
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise SpoonacularError(f"Request failed: {e}") from e
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    break
+            time.sleep(self._backoff_delay(attempt, response))
+
+        if not response.ok:
+            raise SpoonacularError(
+                f"Spoonacular returned HTTP {response.status_code} for {url}",
+                status_code=response.status_code
+            )
+        return response
+
+    def get_json(self, path: str, params: Optional[Dict] = None) -> Any:
+        """GET an API path relative to the base URL and decode the JSON body"""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        if self.scheduler is None:
+            return self.request(url, params=dict(params or {}, apiKey=self.api_key)).json()
+
+        with self.scheduler.slot(estimate_points(path, params)) as ticket:
+            try:
+                response = self.request(url, params=dict(params or {}, apiKey=self.api_key))
+            except SpoonacularError as e:
+                if e.status_code == 402:  # Spoonacular's "daily points limit reached"
+                    self.scheduler.mark_exhausted()
+                raise
+            self.scheduler.record(ticket, response.headers)
+        return response.json()
+
+    def get_bytes(self, url: str, timeout=None) -> bytes:
+        """Download a file such as a recipe image"""
+        return self.request(url, timeout=timeout).content
+
+    def find_by_ingredients(self, ingredients: str, number: int = 10, ranking: int = 2,
+                            ignore_pantry: bool = True, diet: Optional[str] = None,
+                            max_ready_time: Optional[int] = None) -> List[Dict]:
+        params = {
+            'ingredients': ingredients,
+            'number': number,
+            'ranking': ranking,
+            'ignorePantry': ignore_pantry
+        }
+        if diet:
+            params['diet'] = diet
+        if max_ready_time:
+            params['maxReadyTime'] = max_ready_time
+        return self.get_json('findByIngredients', params)
+
+    def information(self, recipe_id: int, include_nutrition: bool = False) -> Dict:
+        params = {'includeNutrition': True} if include_nutrition else None
+        return self.get_json(f'{recipe_id}/information', params)
+
+    def information_bulk(self, recipe_ids: Iterable[int], include_nutrition: bool = False) -> List[Dict]:
+        params = {'ids': ','.join(str(recipe_id) for recipe_id in recipe_ids)}
+        if include_nutrition:
+            params['includeNutrition'] = True
+        return self.get_json('informationBulk', params)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+class AsyncSpoonacularClient:
+    """asyncio front end that runs client calls concurrently on worker threads"""
+
+    def __init__(self, client: SpoonacularClient, concurrency: int = 8):
+        self.client = client
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _call(self, fn, *args, **kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def find_by_ingredients(self, ingredients: str, **kwargs) -> List[Dict]:
+        return await self._call(self.client.find_by_ingredients, ingredients, **kwargs)
+
+    async def information(self, recipe_id: int, **kwargs) -> Dict:
+        return await self._call(self.client.information, recipe_id, **kwargs)
+
+    async def information_bulk(self, recipe_ids: Iterable[int], **kwargs) -> List[Dict]:
+        return await self._call(self.client.information_bulk, list(recipe_ids), **kwargs)
+
+    async def information_many(self, recipe_ids: Iterable[int], **kwargs) -> List[Dict]:
+        """Fetch many recipes concurrently, one request each"""
+        return await asyncio.gather(*(self.information(recipe_id, **kwargs) for recipe_id in recipe_ids))
@@ -0,0 +1,340 @@
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from tracing import tracer
+
+
+def _create_core_tables(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS favorites (
+            recipe_id INTEGER PRIMARY KEY,
+            title TEXT,
+            image_url TEXT,
+            date_added TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS meal_plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipe_id INTEGER,
+            planned_date DATE,
+            meal_type TEXT
+        )
+    ''')
+
+
+def _create_indexes(conn: sqlite3.Connection):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_meal_plans_date ON meal_plans (planned_date, meal_type)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_meal_plans_recipe ON meal_plans (recipe_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_favorites_date_added ON favorites (date_added)")
+
+
+def _create_api_cache(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS api_cache (
+            cache_key TEXT PRIMARY KEY,
+            endpoint TEXT,
+            response TEXT,
+            created_at REAL,
+            last_access REAL
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_api_cache_last_access ON api_cache (last_access)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_api_cache_endpoint ON api_cache (endpoint)")
+
+
+def _create_ingredient_index(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS indexed_recipes (
+            recipe_id INTEGER PRIMARY KEY,
+            title TEXT,
+            image TEXT,
+            ready_in_minutes INTEGER,
+            servings INTEGER,
+            vegetarian INTEGER,
+            vegan INTEGER,
+            gluten_free INTEGER,
+            ingredient_count INTEGER,
+            updated_at REAL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS recipe_ingredients (
+            ingredient TEXT,
+            recipe_id INTEGER,
+            PRIMARY KEY (ingredient, recipe_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_recipe ON recipe_ingredients (recipe_id)")
+    conn.execute("CREATE TABLE IF NOT EXISTS ingredient_names (name TEXT PRIMARY KEY)")
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS ingredient_fts "
+            "USING fts5(name, tokenize='porter unicode61')"
+        )
+    except sqlite3.OperationalError:
+        pass  # SQLite built without FTS5; IngredientIndex falls back to LIKE
+
+
+def _create_recipe_nutrients(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS recipe_nutrients (
+            recipe_id INTEGER,
+            nutrient TEXT,
+            amount REAL,
+            unit TEXT,
+            PRIMARY KEY (recipe_id, nutrient)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _shopping_list_delta(recipe_id: str, sign: str) -> str:
+    """Trigger statements adding (sign '+') or removing ('-') one planned meal of a recipe"""
+    lines = f"SELECT item FROM recipe_shopping_lines WHERE recipe_id = {recipe_id}"
+    statements = []
+    if sign == '+':
+        statements.append(f'''
+            INSERT OR IGNORE INTO shopping_list_items (item, name, aisle, unit)
+            SELECT item, name, aisle, unit FROM recipe_shopping_lines WHERE recipe_id = {recipe_id};''')
+    statements.append(f'''
+            UPDATE shopping_list_items SET
+                amount = amount {sign} (SELECT l.amount FROM recipe_shopping_lines l
+                                        WHERE l.recipe_id = {recipe_id} AND l.item = shopping_list_items.item),
+                lines = lines {sign} (SELECT l.lines FROM recipe_shopping_lines l
+                                      WHERE l.recipe_id = {recipe_id} AND l.item = shopping_list_items.item),
+                meals = meals {sign} 1
+            WHERE item IN ({lines});''')
+    if sign == '-':
+        statements.append(f"DELETE FROM shopping_list_items WHERE meals <= 0 AND item IN ({lines});")
+    return ''.join(statements)
+
+
+def _shopping_line_delta(line: str, sign: str) -> str:
+    """Trigger statements adding or removing one recipe line for every meal planned with it"""
+    planned = f"(SELECT COUNT(*) FROM meal_plans WHERE recipe_id = {line}.recipe_id)"
+    statements = []
+    if sign == '+':
+        statements.append(f'''
+            INSERT OR IGNORE INTO shopping_list_items (item, name, aisle, unit)
+            VALUES ({line}.item, {line}.name, {line}.aisle, {line}.unit);''')
+    statements.append(f'''
+            UPDATE shopping_list_items SET
+                amount = amount {sign} {line}.amount * {planned},
+                lines = lines {sign} {line}.lines * {planned},
+                meals = meals {sign} {planned}
+            WHERE item = {line}.item;''')
+    if sign == '-':
+        statements.append(f"DELETE FROM shopping_list_items WHERE meals <= 0 AND item = {line}.item;")
+    return ''.join(statements)
+
+
+def _create_shopping_list(conn: sqlite3.Connection):
+    # Each recipe's ingredients totalled per shopping list item
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS recipe_shopping_lines (
+            recipe_id INTEGER,
+            item TEXT,
+            name TEXT,
+            aisle TEXT,
+            unit TEXT,
+            amount REAL,
+            lines INTEGER,
+            PRIMARY KEY (recipe_id, item)
+        ) WITHOUT ROWID
+    ''')
+    # The combined list for every planned meal, kept up to date by the triggers below
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS shopping_list_items (
+            item TEXT PRIMARY KEY,
+            name TEXT,
+            aisle TEXT,
+            unit TEXT,
+            amount REAL NOT NULL DEFAULT 0,
+            lines INTEGER NOT NULL DEFAULT 0,
+            meals INTEGER NOT NULL DEFAULT 0,
+            checked INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_shopping_list_items_aisle ON shopping_list_items (aisle, name)")
+
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS shopping_list_meal_added AFTER INSERT ON meal_plans
+        BEGIN {_shopping_list_delta('NEW.recipe_id', '+')}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS shopping_list_meal_removed AFTER DELETE ON meal_plans
+        BEGIN {_shopping_list_delta('OLD.recipe_id', '-')}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS shopping_list_meal_changed AFTER UPDATE OF recipe_id ON meal_plans
+        WHEN OLD.recipe_id IS NOT NEW.recipe_id
+        BEGIN {_shopping_list_delta('OLD.recipe_id', '-')}{_shopping_list_delta('NEW.recipe_id', '+')}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS shopping_list_line_added AFTER INSERT ON recipe_shopping_lines
+        WHEN EXISTS (SELECT 1 FROM meal_plans WHERE recipe_id = NEW.recipe_id)
+        BEGIN {_shopping_line_delta('NEW', '+')}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS shopping_list_line_removed AFTER DELETE ON recipe_shopping_lines
+        WHEN EXISTS (SELECT 1 FROM meal_plans WHERE recipe_id = OLD.recipe_id)
+        BEGIN {_shopping_line_delta('OLD', '-')}
+        END
+    ''')
+
+
+# Schema migrations, applied in order. Append new ones; never edit old ones.
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _create_core_tables,
+    _create_indexes,
+    _create_api_cache,
+    _create_ingredient_index,
+    _create_recipe_nutrients,
+    _create_shopping_list,
+]
+
+
+def _caller_name() -> str:
+    """module.function that entered Storage.transaction()"""
+    # Frames: this function, the transaction generator, contextmanager's __enter__, the caller
+    code = sys._getframe(3).f_code
+    # co_qualname is Python 3.11+
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{os.path.splitext(os.path.basename(code.co_filename))[0]}.{name}"
+
+
+class Storage:
+    """SQLite access with per-thread WAL connections, migrations and batched writes"""
+
+    def __init__(self, db_path: str = 'recipe_finder.db', busy_timeout_ms: int = 5000,
+                 write_batch_size: int = 500):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.write_batch_size = write_batch_size
+        self._local = threading.local()
+
+        self.migrate()
+
+        # Fire-and-forget writes are grouped into transactions by one writer thread
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name='db-writer')
+        self._writer.start()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # Durable enough with WAL, far fewer fsyncs
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run statements atomically on this thread's connection"""
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn  # Nested use joins the outer transaction
+            return
+        # Spans name the caller, so traces show whose transactions are slow
+        with tracer.span('db.transaction', 'db', caller=_caller_name() if tracer.enabled else None):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    def migrate(self):
+        """Apply any schema migrations newer than the stored version"""
+        with self.transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+            row = conn.execute("SELECT version FROM schema_version").fetchone()
+            version = row[0] if row else 0
+            for migration in MIGRATIONS[version:]:
+                migration(conn)
+            if row is None:
+                conn.execute("INSERT INTO schema_version (version) VALUES (?)", (len(MIGRATIONS),))
+            else:
+                conn.execute("UPDATE schema_version SET version = ?", (len(MIGRATIONS),))
+
+    def query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with tracer.span('db.query', 'db', sql=sql):
+            return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        with tracer.span('db.query', 'db', sql=sql):
+            return self.connection().execute(sql, params).fetchone()
+
+    def iterate(self, sql: str, params: Sequence = (), chunk_size: int = 1000) -> Iterator[tuple]:
+        """Yield rows a chunk at a time instead of loading the whole result"""
+        with tracer.span('db.query', 'db', sql=sql):
+            cursor = self.connection().execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+
+    def execute(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        with tracer.span('db.execute', 'db', sql=sql), self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def executemany(self, sql: str, rows: Iterable[Sequence]):
+        with tracer.span('db.executemany', 'db', sql=sql), self.transaction() as conn:
+            conn.executemany(sql, rows)
+
+    def submit_write(self, sql: str, params: Sequence = (),
+                     callback: Optional[Callable[[Optional[Exception]], Any]] = None):
+        """Queue a write for the writer thread
+
+        Queued writes are committed together in one transaction.
+        callback(error) runs on the writer thread once the batch is committed
+        (error is None) or has failed.
+        """
+        self._writes.put((sql, params, callback))
+
+    def _write_loop(self):
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with tracer.span('db.write_batch', 'db', writes=len(batch)), self.transaction() as conn:
+                    for sql, params, _ in batch:
+                        conn.execute(sql, params)
+                results = [(callback, None) for _, _, callback in batch]
+            except Exception:
+                # Retry one by one so a single bad write does not fail the others
+                results = []
+                for sql, params, callback in batch:
+                    try:
+                        self.execute(sql, params)
+                        results.append((callback, None))
+                    except Exception as e:
+                        results.append((callback, e))
+
+            for callback, error in results:
+                if callback is not None:
+                    try:
+                        callback(error)
+                    except Exception:
+                        pass
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional
+
+
+class ThumbnailCache:
+    """Content-addressed disk cache of resized, encoded recipe thumbnails"""
+
+    def __init__(self, cache_dir: str = 'thumbnails', max_bytes: int = 50 * 1024 * 1024,
+                 quality: int = 85):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.quality = quality
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._total_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and entry.name.endswith('.jpg')
+        )
+
+    def path_for(self, url: str) -> str:
+        """Return the cache file path for an image URL"""
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.jpg")
+
+    def __contains__(self, url: str) -> bool:
+        return os.path.exists(self.path_for(url))
+
+    def get(self, url: str) -> Optional["Image.Image"]:
+        """Return the cached thumbnail, or None if it is not cached"""
+        from PIL import Image  # Imported on first use to keep startup fast
+
+        path = self.path_for(url)
+        try:
+            img = Image.open(path)
+            img.load()
+        except (OSError, ValueError):
+            return None
+        try:
+            # Modification time doubles as the LRU timestamp
+            os.utime(path)
+        except OSError:
+            pass
+        return img
+
+    def put(self, url: str, img: "Image.Image"):
+        """Encode and store a thumbnail, evicting old entries over the size cap"""
+        path = self.path_for(url)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Write to a temp file first so readers never see a partial image
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                img.save(f, format='JPEG', quality=self.quality)
+            size = os.path.getsize(tmp_path)
+            with self._lock:
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+                self._total_bytes += size - old_size
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict(self):
+        """Delete least recently used thumbnails until under the size cap"""
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir)
+             if entry.is_file() and entry.name.endswith('.jpg')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        target = self.max_bytes * 0.9  # Leave some headroom to avoid evicting on every put
+        for entry in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._total_bytes -= size
+            except OSError:
+                pass
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
@@ -0,0 +1,154 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKET_BOUNDS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf')]
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out while tracing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer._record(self.name, self.category, self.start, end, self.args)
+        return False
+
+
+class Histogram:
+    """Bucketed span durations for one span name"""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKET_BOUNDS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, duration_ms: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples"""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max_ms,
+        }
+
+
+class Tracer:
+    """Timing spans aggregated into per-name histograms
+
+    Spans are recorded only while enabled; otherwise span() returns a shared
+    no-op context manager so instrumented code pays a single attribute check.
+    The most recent spans are also kept for Chrome trace-event export.
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = 50000):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=max_events)
+        self._histograms: Dict[str, Histogram] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter()
+
+    def span(self, name: str, category: str = 'app', **args):
+        """Time a block: `with tracer.span('db.query', 'db', sql=sql): ...`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def _record(self, name: str, category: str, start: float, end: float, args: Dict):
+        thread = threading.current_thread()
+        with self._lock:
+            self._thread_names[thread.ident] = thread.name
+            self._events.append((name, category, start, end, thread.ident, args))
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add((end - start) * 1000)
+
+    def histograms(self) -> Dict[str, Dict[str, float]]:
+        """Summary statistics per span name"""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._events.clear()
+            self._histograms.clear()
+
+    def chrome_trace(self) -> Dict[str, List[Dict]]:
+        """Recorded spans in Chrome trace-event format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+
+        trace_events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+            for tid, thread_name in thread_names.items()
+        ]
+        for name, category, start, end, tid, args in events:
+            trace_events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': pid,
+                'tid': tid,
+                'args': {key: str(value) for key, value in args.items()},
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+# Process-wide tracer used by the instrumented modules; RECIPE_TRACE=1 enables it at startup
+tracer = Tracer(enabled=os.environ.get('RECIPE_TRACE') == '1')
@@ -0,0 +1,47 @@
+import queue
+import sys
+import time
+from typing import Callable
+
+
+class UIDispatcher:
+    """Run UI mutations posted from any thread on the Tk main loop
+
+    Tk is not thread-safe, so worker threads post callables here instead of
+    touching widgets. The queue is drained with after() in batches limited by
+    a task count and a time budget per tick, so large updates are spread over
+    several frames instead of freezing the window.
+    """
+
+    def __init__(self, root, max_per_tick: int = 12, frame_budget_ms: float = 12, poll_ms: int = 16):
+        self.root = root
+        self.max_per_tick = max_per_tick
+        self.frame_budget = frame_budget_ms / 1000
+        self.poll_ms = poll_ms
+        self._queue = queue.Queue()
+        self.root.after(self.poll_ms, self._drain)
+
+    def post(self, fn: Callable, *args, **kwargs):
+        """Queue fn(*args, **kwargs) to run on the Tk thread; safe to call from any thread"""
+        self._queue.put((fn, args, kwargs))
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.frame_budget
+        for _ in range(self.max_per_tick):
+            try:
+                fn, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+            if time.perf_counter() >= deadline:
+                break
+
+        # Come back immediately while there is a backlog, otherwise poll
+        self.root.after(1 if not self._queue.empty() else self.poll_ms, self._drain)